@@ -0,0 +1 @@
+"""Benchmarks of the Cudy Router integration."""
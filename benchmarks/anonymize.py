@@ -0,0 +1,28 @@
+"""Anonymizes a page saved from a Cudy router before adding it to the captures.
+
+Usage: python -m benchmarks.anonymize saved-page.html benchmarks/captures/devlist-<model>.html
+
+MAC and IP addresses, hostnames, IMEI/ICCID like numbers and the session
+tokens are replaced by stable placeholders. Review the result before
+committing it, the firmware may show other personal data.
+"""
+from __future__ import annotations
+
+import sys
+
+from custom_components.cudy_router.capture import Anonymizer
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 2:
+        print(__doc__, file=sys.stderr)
+        return 2
+    with open(argv[0], encoding="utf-8", errors="replace") as source:
+        page = Anonymizer().anonymize(source.read())
+    with open(argv[1], "w", encoding="utf-8") as target:
+        target.write(page)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,193 @@
+"""Microbenchmarks of the parsers of the router pages.
+
+Usage: python -m benchmarks.bench_parser [--save | --compare] [options]
+
+Every parser function is run on generated device list pages of 10 to 2000
+clients, on a generated modem status page and on the recorded pages in
+benchmarks/captures. For each case the median and minimum time, the peak
+traced memory and the memory and blocks still held by the result are
+reported. --save stores them as the baseline, --compare flags the cases
+that got slower or use more memory than the baseline and exits with 1 if
+there are any.
+
+Times depend on the machine, compare them with a baseline saved on the
+same one. Memory figures only depend on the Python version.
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Iterator
+import gc
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from custom_components.cudy_router import parser
+
+from .fixtures import devlist_page, gcom_page, load_captures
+
+CLIENT_COUNTS = (10, 100, 500, 2000)
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+# Devices tracked in the parse_devices cases, as set in the options
+TRACKED_DEVICES = 10
+
+
+def _tracked_devices(page: str) -> str:
+    devices = parser.get_all_devices(page)[:TRACKED_DEVICES]
+    return "\n".join(f"device-{i}={device.mac}" for i, device in enumerate(devices))
+
+
+def _cases(
+    client_counts: tuple[int, ...], engines: list[str]
+) -> Iterator[tuple[str, Callable[[], Any]]]:
+    """Yields the name and the function of every benchmark case."""
+
+    devlists = {f"{clients}": devlist_page(clients, seed=clients) for clients in client_counts}
+    gcoms = {"generated": gcom_page()}
+    for name, page in load_captures().items():
+        (devlists if name.startswith("devlist") else gcoms)[name] = page
+
+    for name, page in devlists.items():
+        for engine in engines:
+            yield f"get_all_devices[{engine}]/{name}", lambda p=page, e=engine: parser.get_all_devices(p, e)
+        device_list = _tracked_devices(page)
+        yield f"parse_devices/{name}", lambda p=page, d=device_list: parser.parse_devices(p, d)
+        # Second poll of the same page, with the previous data
+        previous = parser.parse_devices(page, device_list)
+        yield (
+            f"parse_devices+previous/{name}",
+            lambda p=page, d=device_list, v=previous: parser.parse_devices(p, d, v),
+        )
+    for name, page in gcoms.items():
+        for engine in engines:
+            yield f"parse_tables[{engine}]/{name}", lambda p=page, e=engine: parser.parse_tables(p, e)
+        yield f"parse_modem_info/{name}", lambda p=page: parser.parse_modem_info(p)
+
+
+def measure(function: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Runs the function and returns its timings and memory usage."""
+
+    timings = []
+    for _ in range(repeat):
+        # Durations are memoized, start every run as a new poll would
+        parser.get_seconds_duration.cache_clear()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    parser.get_seconds_duration.cache_clear()
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    retained, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del result
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "peak_bytes": peak,
+        "retained_bytes": retained,
+        "retained_blocks": blocks,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    time_threshold: float,
+    memory_threshold: float,
+) -> list[str]:
+    """Returns the regressions of the results compared with the baseline."""
+
+    regressions = []
+    for name, result in results.items():
+        if not (base := baseline.get(name)):
+            continue
+        checks = (
+            ("median", time_threshold),
+            ("peak_bytes", memory_threshold),
+            ("retained_bytes", memory_threshold),
+        )
+        for metric, threshold in checks:
+            if base[metric] and result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {_format(metric, result[metric])}"
+                    f" > {_format(metric, base[metric])} (+{result[metric] / base[metric] - 1:.0%})"
+                )
+    return regressions
+
+
+def _format(metric: str, value: float) -> str:
+    if metric in ("median", "min"):
+        return f"{value * 1000:.2f} ms"
+    if metric.endswith("bytes"):
+        return f"{value / 1024:.1f} KiB"
+    return f"{value:.0f}"
+
+
+def main(argv: list[str]) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--clients", default=",".join(map(str, CLIENT_COUNTS)))
+    arguments.add_argument(
+        "--engine",
+        action="append",
+        choices=list(parser.PARSER_ENGINES),
+        help="parser engines to run (default: every installed one)",
+    )
+    arguments.add_argument("--repeat", type=int, default=10)
+    arguments.add_argument("--filter", default="", help="only run the cases containing this text")
+    arguments.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    mode = arguments.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="save the results as the baseline")
+    mode.add_argument("--compare", action="store_true", help="compare the results with the baseline")
+    arguments.add_argument("--time-threshold", type=float, default=0.25)
+    arguments.add_argument("--memory-threshold", type=float, default=0.10)
+    args = arguments.parse_args(argv)
+
+    client_counts = tuple(int(clients) for clients in args.clients.split(",") if clients)
+    engines = args.engine or list(parser.PARSER_ENGINES)
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'case':<48} {'median':>10} {'min':>10} {'peak':>12} {'retained':>12} {'blocks':>8}")
+    for name, function in _cases(client_counts, engines):
+        if args.filter not in name:
+            continue
+        result = results[name] = measure(function, args.repeat)
+        print(
+            f"{name:<48} {_format('median', result['median']):>10} {_format('min', result['min']):>10}"
+            f" {_format('peak_bytes', result['peak_bytes']):>12}"
+            f" {_format('retained_bytes', result['retained_bytes']):>12}"
+            f" {result['retained_blocks']:>8}"
+        )
+
+    if args.save:
+        baseline = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved the baseline to {args.baseline}")
+    elif args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("python") != platform.python_version():
+            print(f"Baseline made with Python {baseline.get('python')}, memory figures may differ")
+        regressions = compare(
+            results, baseline["results"], args.time_threshold, args.memory_threshold
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
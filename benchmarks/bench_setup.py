@@ -0,0 +1,117 @@
+"""Setup time and memory of a config entry versus the number of tracked devices.
+
+Usage: python -m benchmarks.bench_setup [--devices 10 40 80 160]
+
+Sets up the integration in a bare Home Assistant instance, against an
+emulated router (see benchmarks.emulator) whose clients are all tracked,
+and reports the time until every platform is set up, the entities
+registered and written, and the memory allocated while setting up (peak)
+and still held afterwards. Time and memory are measured in separate runs,
+tracing the allocations slows the setup down.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from custom_components.cudy_router.const import DOMAIN, OPTIONS_DEVICELIST
+
+from .emulator import EmulatorSettings, start_fleet
+
+CUSTOM_COMPONENTS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "custom_components"
+)
+
+
+async def _setup(port: int, devices: int, trace: bool) -> dict[str, float]:
+    """Sets up a config entry tracking every client of an emulated router."""
+
+    settings = EmulatorSettings(clients=devices, latency=0.001, latency_jitter=0, churn_rate=0)
+    fleet, runners = await start_fleet(settings, 1, port)
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(CUSTOM_COMPONENTS, os.path.join(config_dir, "custom_components"))
+        hass = HomeAssistant(config_dir)
+        loader.async_setup(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await bootstrap.async_load_base_functionality(hass)
+        await async_setup_component(hass, "homeassistant", {})
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="bench",
+            data={
+                CONF_HOST: f"127.0.0.1:{port}",
+                CONF_USERNAME: settings.username,
+                CONF_PASSWORD: settings.password,
+            },
+            source=config_entries.SOURCE_USER,
+            options={
+                OPTIONS_DEVICELIST: "\n".join(client["mac"] for client in fleet[0].clients)
+            },
+        )
+
+        if trace:
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+        result = {
+            "time": elapsed,
+            "registered": len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)),
+            "states": len(hass.states.async_all()),
+        }
+        if trace:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["peak"] = peak - before
+            result["retained"] = current - before
+
+        await hass.async_stop(force=True)
+    for runner in runners:
+        await runner.cleanup()
+    return result
+
+
+async def _run(args: argparse.Namespace) -> None:
+    print(
+        f"{'devices':>8} {'setup ms':>9} {'registered':>11} {'states':>7}"
+        f" {'peak KiB':>9} {'retained KiB':>13}"
+    )
+    for devices in args.devices:
+        timed = await _setup(args.port, devices, trace=False)
+        traced = await _setup(args.port, devices, trace=True)
+        print(
+            f"{devices:>8} {timed['time'] * 1000:>9.0f} {timed['registered']:>11}"
+            f" {timed['states']:>7} {traced['peak'] / 1024:>9.0f}"
+            f" {traced['retained'] / 1024:>13.0f}"
+        )
+
+
+def main(argv: list[str]) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--devices", type=int, nargs="+", default=[10, 40, 80, 160])
+    arguments.add_argument("--port", type=int, default=8080)
+    args = arguments.parse_args(argv)
+    # Only the results are printed
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
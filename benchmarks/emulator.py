@@ -0,0 +1,297 @@
+"""Local emulator of the web interface of Cudy routers.
+
+Usage: python -m benchmarks.emulator [--routers N] [--port 8080] [options]
+
+Serves the LuCI login (salt and token hashed password, sysauth cookie, 403
+once the session has expired) and the device list and modem status pages
+read by the integration. Every router listens on its own port, starting at
+--port, so a fleet can be added to Home Assistant (host 127.0.0.1:<port>)
+or driven by benchmarks.load_test without any network.
+
+The knobs reproduce what is seen on real networks: slow responses, short
+sessions, routers keeping only a few sessions, failing or hanging requests,
+clients joining and leaving.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import hashlib
+import random
+import secrets
+import sys
+import time
+
+from aiohttp import web
+
+from .fixtures import gcom_page, random_client, render_devlist
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><body>
+<form method="post" action="/cgi-bin/luci">
+<input type="hidden" name="_csrf" value="{csrf}">
+<input type="hidden" name="token" value="{token}">
+<input type="hidden" name="salt" value="{salt}">
+<input type="text" name="luci_username">
+<input type="password" name="luci_password">
+</form>
+</body></html>
+"""
+LUCI_PATH = "/cgi-bin/luci"
+DEVICES_PATH = f"{LUCI_PATH}/admin/network/devices/devlist"
+MODEM_STATUS_PATH = f"{LUCI_PATH}/admin/network/gcom/status"
+
+
+@dataclass
+class EmulatorSettings:
+    """Behavior of the emulated routers."""
+
+    username: str = "admin"
+    password: str = "admin"
+    clients: int = 50
+    # Mean response delay and its random variation, in seconds
+    latency: float = 0.05
+    latency_jitter: float = 0.02
+    # Seconds after which a session is rejected with 403
+    session_lifetime: float = 600
+    # Sessions kept by the router, logging in drops the oldest ones
+    max_sessions: int = 4
+    # Fraction of the requests answered with a 500 error
+    error_rate: float = 0.0
+    # Fraction of the requests that hang for hang_time seconds
+    hang_rate: float = 0.0
+    hang_time: float = 60
+    # Fraction of the clients replaced by new ones at every device list request
+    churn_rate: float = 0.02
+    # Serve the modem status page (routers without a modem answer 404)
+    modem: bool = True
+
+
+@dataclass
+class EmulatorStats:
+    """Requests handled by an emulated router."""
+
+    login_pages: int = 0
+    logins: int = 0
+    failed_logins: int = 0
+    pages: int = 0
+    rejected: int = 0
+    errors: int = 0
+    hangs: int = 0
+
+
+@dataclass
+class EmulatedRouter:
+    """State of an emulated router."""
+
+    settings: EmulatorSettings
+    seed: int = 0
+    stats: EmulatorStats = field(default_factory=EmulatorStats)
+    # Salt of the login tokens handed out and not used yet
+    tokens: dict[str, str] = field(default_factory=dict)
+    # Creation time of the valid sessions, oldest first
+    sessions: dict[str, float] = field(default_factory=dict)
+    clients: list[dict[str, str]] = field(default_factory=list)
+    rng: random.Random = field(init=False)
+    _next_client: int = 0
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+        self.clients = [self._new_client() for _ in range(self.settings.clients)]
+
+    def _new_client(self) -> dict[str, str]:
+        client = random_client(self.rng, self._next_client)
+        self._next_client += 1
+        return client
+
+    def _churn(self) -> None:
+        for i in range(len(self.clients)):
+            if self.rng.random() < self.settings.churn_rate:
+                self.clients[i] = self._new_client()
+
+    def _session_valid(self, request: web.Request) -> bool:
+        cookie = request.cookies.get("sysauth")
+        created = self.sessions.get(cookie) if cookie else None
+        if created is None:
+            return False
+        if time.monotonic() - created > self.settings.session_lifetime:
+            del self.sessions[cookie]
+            return False
+        return True
+
+    async def _delay(self) -> web.Response | None:
+        """Applies the latency and the injected faults to a request."""
+
+        settings = self.settings
+        await asyncio.sleep(
+            max(0.0, self.rng.gauss(settings.latency, settings.latency_jitter))
+        )
+        if self.rng.random() < settings.hang_rate:
+            self.stats.hangs += 1
+            await asyncio.sleep(settings.hang_time)
+        if self.rng.random() < settings.error_rate:
+            self.stats.errors += 1
+            return web.Response(status=500, text="Internal Server Error")
+        return None
+
+    async def login_page(self, request: web.Request) -> web.Response:
+        if error := await self._delay():
+            return error
+        self.stats.login_pages += 1
+        token = secrets.token_hex(16)
+        salt = secrets.token_hex(8)
+        self.tokens[token] = salt
+        return web.Response(
+            text=LOGIN_PAGE.format(csrf=secrets.token_hex(16), token=token, salt=salt),
+            content_type="text/html",
+        )
+
+    async def login(self, request: web.Request) -> web.Response:
+        if error := await self._delay():
+            return error
+        form = await request.post()
+        salt = self.tokens.pop(form.get("token", ""), None)
+        settings = self.settings
+        if salt is not None:
+            hashed = hashlib.sha256((settings.password + salt).encode()).hexdigest()
+            expected = hashlib.sha256((hashed + form["token"]).encode()).hexdigest()
+        else:
+            expected = None
+        if (
+            form.get("luci_username") != settings.username
+            or expected is None
+            or form.get("luci_password") != expected
+        ):
+            self.stats.failed_logins += 1
+            return web.Response(status=403, text="Login failed", content_type="text/html")
+
+        self.stats.logins += 1
+        cookie = secrets.token_hex(16)
+        self.sessions[cookie] = time.monotonic()
+        while len(self.sessions) > settings.max_sessions:
+            del self.sessions[next(iter(self.sessions))]
+        response = web.HTTPFound(f"{LUCI_PATH}/admin/panel")
+        response.set_cookie("sysauth", cookie, path=f"{LUCI_PATH}/", httponly=True)
+        return response
+
+    async def devices(self, request: web.Request) -> web.Response:
+        return await self._page(request, self._devlist)
+
+    async def modem_status(self, request: web.Request) -> web.Response:
+        if not self.settings.modem:
+            raise web.HTTPNotFound()
+        return await self._page(request, lambda: gcom_page(self.rng.randint(0, 9)))
+
+    def _devlist(self) -> str:
+        self._churn()
+        return render_devlist(self.clients)
+
+    async def _page(
+        self, request: web.Request, render: Callable[[], str]
+    ) -> web.Response:
+        if error := await self._delay():
+            return error
+        if not self._session_valid(request):
+            self.stats.rejected += 1
+            return web.Response(status=403, text="Forbidden", content_type="text/html")
+        self.stats.pages += 1
+        return web.Response(text=render(), content_type="text/html")
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(LUCI_PATH, self.login_page)
+        app.router.add_post(LUCI_PATH, self.login)
+        app.router.add_get(DEVICES_PATH, self.devices)
+        app.router.add_get(MODEM_STATUS_PATH, self.modem_status)
+        return app
+
+
+async def start_fleet(
+    settings: EmulatorSettings, routers: int, port: int, bind: str = "127.0.0.1"
+) -> tuple[list[EmulatedRouter], list[web.AppRunner]]:
+    """Starts the given number of emulated routers on consecutive ports."""
+
+    fleet = []
+    runners = []
+    for i in range(routers):
+        router = EmulatedRouter(settings, seed=i)
+        runner = web.AppRunner(router.create_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, bind, port + i).start()
+        fleet.append(router)
+        runners.append(runner)
+    return fleet, runners
+
+
+def add_settings_arguments(arguments: argparse.ArgumentParser) -> None:
+    """Adds the knobs of the emulated routers to the command line arguments."""
+
+    defaults = EmulatorSettings()
+    arguments.add_argument("--username", default=defaults.username)
+    arguments.add_argument("--password", default=defaults.password)
+    arguments.add_argument("--clients", type=int, default=defaults.clients)
+    arguments.add_argument("--latency", type=float, default=defaults.latency)
+    arguments.add_argument("--latency-jitter", type=float, default=defaults.latency_jitter)
+    arguments.add_argument("--session-lifetime", type=float, default=defaults.session_lifetime)
+    arguments.add_argument("--max-sessions", type=int, default=defaults.max_sessions)
+    arguments.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    arguments.add_argument("--hang-rate", type=float, default=defaults.hang_rate)
+    arguments.add_argument("--hang-time", type=float, default=defaults.hang_time)
+    arguments.add_argument("--churn-rate", type=float, default=defaults.churn_rate)
+    arguments.add_argument("--no-modem", dest="modem", action="store_false")
+
+
+def settings_from_arguments(args: argparse.Namespace) -> EmulatorSettings:
+    """Returns the settings given on the command line."""
+
+    return EmulatorSettings(
+        username=args.username,
+        password=args.password,
+        clients=args.clients,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        session_lifetime=args.session_lifetime,
+        max_sessions=args.max_sessions,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_time=args.hang_time,
+        churn_rate=args.churn_rate,
+        modem=args.modem,
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    fleet, runners = await start_fleet(
+        settings_from_arguments(args), args.routers, args.port, args.bind
+    )
+    print(
+        f"Emulating {args.routers} router(s) on {args.bind}:{args.port}"
+        f"-{args.port + args.routers - 1}, press Ctrl+C to stop"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for i, router in enumerate(fleet):
+            print(f"{args.port + i}: {router.stats}")
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main(argv: list[str]) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--routers", type=int, default=1)
+    arguments.add_argument("--port", type=int, default=8080)
+    arguments.add_argument("--bind", default="127.0.0.1")
+    add_settings_arguments(arguments)
+    args = arguments.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
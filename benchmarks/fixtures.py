@@ -0,0 +1,156 @@
+"""Synthetic and recorded pages of the Cudy router web interface."""
+from __future__ import annotations
+
+from pathlib import Path
+import random
+
+CAPTURES_DIR = Path(__file__).parent / "captures"
+
+# Page chrome around the content, as served by the LuCI based firmware
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Cudy - {title}</title>
+<link rel="stylesheet" href="/luci-static/bootstrap/css/bootstrap.min.css?v=1.0">
+<link rel="stylesheet" href="/luci-static/cudy/css/style.css?v=1.0">
+<script src="/luci-static/resources/cbi.js?v=1.0"></script>
+</head>
+<body class="lang_en">
+<nav class="navbar navbar-default">
+<ul class="nav navbar-nav">
+{menu}
+</ul>
+</nav>
+<div class="container" id="maincontent">
+"""
+_PAGE_TAIL = """</div>
+<footer class="footer"><p class="text-muted">Copyright Cudy</p></footer>
+<script>
+var tableHeader = "<table class=\\"table\\"><tr><th></th></tr></table>";
+$(function() {{ XHR.poll(5, '{url}', null, function(x, data) {{ }}); }});
+</script>
+</body>
+</html>
+"""
+_MENU_ITEMS = ("Status", "Internet", "Wireless", "LAN", "Devices", "VPN", "Advanced", "System")
+
+
+def _page(title: str, url: str, content: str) -> str:
+    menu = "\n".join(
+        f'<li class="dropdown"><a href="/cgi-bin/luci/admin/{item.lower()}">{item}</a></li>'
+        for item in _MENU_ITEMS
+    )
+    return (
+        _PAGE_HEAD.format(title=title, menu=menu)
+        + content
+        + _PAGE_TAIL.format(url=url)
+    )
+
+
+def _online_time(rng: random.Random) -> str:
+    clock = f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+    if rng.random() < 0.3:
+        return f"{rng.randint(1, 30)} Day {clock}"
+    return clock
+
+
+def _speed(rng: random.Random) -> str:
+    unit = rng.choice(("Kbps", "Kbps", "Mbps", "bps"))
+    return f"{rng.randint(0, 900)}.{rng.randint(0, 99):02d} {unit}"
+
+
+def random_client(rng: random.Random, index: int) -> dict[str, str]:
+    """Returns the values shown for a client in the device list."""
+
+    connection = rng.choice(("Wired", "2.4G WiFi", "5G WiFi", "5G WiFi"))
+    hostname = f"client-{index:04d}" if rng.random() < 0.9 else "Unknown"
+    return {
+        "connection": connection,
+        "hostname": hostname,
+        "vendor": f"Vendor {index % 17}",
+        "ip": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+        "mac": f"02:00:{index >> 16 & 255:02X}:{index >> 8 & 255:02X}:{index & 255:02X}:{rng.randint(0, 255):02X}",
+        "upload": _speed(rng),
+        "download": _speed(rng),
+        "signal": "---" if connection == "Wired" else f"-{rng.randint(30, 90)} dBm",
+        "online": _online_time(rng),
+    }
+
+
+def render_devlist(clients: list[dict[str, str]]) -> str:
+    """Returns the device list page (devlist?detail=1) of the given clients."""
+
+    rows = [
+        '<tr class="cbi-section-table-titles"><th>Hostname</th><th>IP/MAC</th>'
+        "<th>Upload/Download</th><th>Signal</th><th>Online</th></tr>"
+    ]
+    for i, client in enumerate(clients):
+        rows.append(
+            f"""<tr class="cbi-section-table-row" id="cbi-table-{i}">
+<td class="cbi-value-field"><div id="cbi-table-{i}-hostname"><p class="visible-xs"><span class="text-primary">{client["connection"]}</span> {client["hostname"]}<br>{client["vendor"]}</p><p class="hidden-xs">{client["hostname"]}</p></div></td>
+<td class="cbi-value-field"><div id="cbi-table-{i}-ipmac"><p class="visible-xs">{client["ip"]}<br>{client["mac"]}</p><p class="hidden-xs">{client["ip"]}</p></div></td>
+<td class="cbi-value-field"><div id="cbi-table-{i}-speed"><p class="visible-xs">{client["upload"]}<br>{client["download"]}</p></div></td>
+<td class="cbi-value-field"><div id="cbi-table-{i}-signal"><p class="visible-xs">{client["signal"]}</p></div></td>
+<td class="cbi-value-field"><div id="cbi-table-{i}-online"><p class="visible-xs">{client["online"]}</p></div></td>
+</tr>"""
+        )
+    content = (
+        '<div class="cbi-map" id="cbi-devices"><fieldset class="cbi-section">'
+        '<table class="table cbi-section-table">\n' + "\n".join(rows) + "\n</table></fieldset></div>"
+    )
+    return _page("Devices", "admin/network/devices/devlist?detail=1", content)
+
+
+def devlist_page(clients: int, seed: int = 0) -> str:
+    """Returns a device list page (devlist?detail=1) listing the given number of clients."""
+
+    rng = random.Random(seed)
+    return render_devlist([random_client(rng, i) for i in range(clients)])
+
+
+def gcom_page(seed: int = 0) -> str:
+    """Returns a 4G/LTE modem status page (gcom/status?detail=1)."""
+
+    rng = random.Random(seed)
+    cell_id = rng.randint(0x100000, 0xFFFFFFF)
+    values = {
+        "Status": "Connected",
+        "SIM Card": "Ready",
+        "Network Type": "LTE ...",
+        "MCC": "262",
+        "MNC": "01",
+        "Connected Time": f"{rng.randint(0, 9)} Day {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+        "RSSI": str(-rng.randint(51, 110)),
+        "RSRP": str(-rng.randint(80, 120)),
+        "RSRQ": str(-rng.randint(3, 20)),
+        "SINR": str(rng.randint(-5, 30)),
+        "Cell ID": f"{cell_id:X}",
+        "PCID": str(rng.randint(0, 503)),
+        "PCC": f"BAND {rng.choice((1, 3, 7, 20))} / 20 MHz",
+        "SCC": f"BAND {rng.choice((1, 3, 7, 20))} / 10 MHz",
+        "IMEI": "000000000000000",
+        "IP Address": "100.64.0.2",
+    }
+    rows = "\n".join(
+        f"""<tr><td><p class="visible-xs">{key}</p><p class="hidden-xs">{key}</p></td>
+<td><p class="visible-xs">{value}</p><p class="hidden-xs">{value}</p></td></tr>"""
+        for key, value in values.items()
+    )
+    content = (
+        '<div class="cbi-map"><i class="icon icon-sim1 text-success"></i>'
+        f'<table class="table">\n{rows}\n</table></div>'
+    )
+    return _page("Status", "admin/network/gcom/status?detail=1", content)
+
+
+def load_captures() -> dict[str, str]:
+    """Returns the recorded pages in the captures directory by file name.
+
+    The file name tells the page, e.g. devlist-<model>.html or gcom-<model>.html.
+    """
+
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(CAPTURES_DIR.glob("*.html"))
+    }
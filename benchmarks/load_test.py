@@ -0,0 +1,163 @@
+"""Load test of the integration's router client against emulated routers.
+
+Usage: python -m benchmarks.load_test [--routers 50] [--duration 60] [options]
+
+Starts a fleet of emulated routers (see benchmarks.emulator), or uses the
+ones already listening with --external, and polls every one of them with
+CudyRouter.get_data, like the coordinator of each config entry would,
+starting at random phases of the scan interval. Reports the poll
+latencies, the failures, the logins and what the routers have seen.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import fields
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+
+from custom_components.cudy_router.const import MODULE_DEVICES, MODULE_MODEM, OPTIONS_DEVICELIST
+from custom_components.cudy_router.metrics import (
+    METRIC_DEVICES_HTTP,
+    METRIC_DEVICES_PARSE,
+    METRIC_LOGIN,
+    METRIC_MODEM_HTTP,
+)
+from custom_components.cudy_router.router import BREAKER_CLOSED, CudyRouter
+
+from .emulator import EmulatorStats, add_settings_arguments, settings_from_arguments, start_fleet
+
+
+class PollStats:
+    """Results of the polls of the fleet."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.latencies: list[float] = []
+        self.failures: dict[str, int] = {}
+
+    def failed(self, err: Exception) -> None:
+        name = type(err).__name__
+        self.failures[name] = self.failures.get(name, 0) + 1
+
+
+async def _poll(
+    hass: HomeAssistant,
+    router: CudyRouter,
+    options: dict[str, Any],
+    interval: float,
+    deadline: float,
+    stats: PollStats,
+) -> None:
+    """Polls a router until the deadline."""
+
+    await asyncio.sleep(random.uniform(0, interval))
+    data = None
+    while time.monotonic() < deadline:
+        start = time.monotonic()
+        try:
+            data = await asyncio.wait_for(
+                router.get_data(hass, options, data, [MODULE_DEVICES, MODULE_MODEM]), 30
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            stats.failed(err)
+        else:
+            stats.latencies.append(time.monotonic() - start)
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+async def _run(args: argparse.Namespace) -> None:
+    settings = settings_from_arguments(args)
+    runners = []
+    fleet = []
+    if not args.external:
+        fleet, runners = await start_fleet(settings, args.routers, args.port)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        options = {
+            CONF_SCAN_INTERVAL: args.interval,
+            OPTIONS_DEVICELIST: "",
+        }
+        routers = [
+            CudyRouter(hass, f"127.0.0.1:{args.port + i}", settings.username, settings.password)
+            for i in range(args.routers)
+        ]
+        stats = PollStats()
+        deadline = time.monotonic() + args.duration
+        print(
+            f"Polling {args.routers} router(s) every {args.interval}s for {args.duration}s"
+        )
+        await asyncio.gather(
+            *(
+                _poll(hass, router, options, args.interval, deadline, stats)
+                for router in routers
+            )
+        )
+        await hass.async_stop(force=True)
+
+    for runner in runners:
+        await runner.cleanup()
+
+    latencies = stats.latencies
+    print(f"Successful polls: {len(latencies)}, failed: {sum(stats.failures.values())} {stats.failures}")
+    if latencies:
+        print(
+            f"Poll latency: p50 {_percentile(latencies, 50) * 1000:.0f} ms,"
+            f" p95 {_percentile(latencies, 95) * 1000:.0f} ms,"
+            f" max {max(latencies) * 1000:.0f} ms"
+        )
+    print(
+        "Logins performed: "
+        f"{sum(router.auth_stats['logins_performed'] for router in routers)}, coalesced: "
+        f"{sum(router.auth_stats['logins_coalesced'] for router in routers)}"
+    )
+    for metric in (METRIC_DEVICES_HTTP, METRIC_DEVICES_PARSE, METRIC_MODEM_HTTP, METRIC_LOGIN):
+        summaries = [router.metrics.summary(metric) for router in routers]
+        if p95s := [summary["p95"] for summary in summaries if summary]:
+            print(f"Worst router p95 of {metric}: {max(p95s):.0f} ms")
+    open_breakers = [router.host for router in routers if router.breaker.state != BREAKER_CLOSED]
+    print(f"Routers paused by the circuit breaker: {len(open_breakers)}")
+    if fleet:
+        totals = {
+            stat.name: sum(getattr(router.stats, stat.name) for router in fleet)
+            for stat in fields(EmulatorStats)
+        }
+        print(f"Emulated routers: {totals}")
+
+
+def main(argv: list[str]) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--routers", type=int, default=50)
+    arguments.add_argument("--port", type=int, default=8080)
+    arguments.add_argument("--duration", type=float, default=60)
+    arguments.add_argument("--interval", type=float, default=15)
+    arguments.add_argument(
+        "--external",
+        action="store_true",
+        help="poll the emulated routers already listening from --port on",
+    )
+    arguments.add_argument("--debug", action="store_true")
+    add_settings_arguments(arguments)
+    args = arguments.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -4,34 +4,107 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .capture import ResponseCapture
+from .const import DOMAIN, OPTIONS_CAPTURE_RESPONSES, STORAGE_VERSION
 from .coordinator import CudyRouterDataUpdateCoordinator
 from .router import CudyRouter
+from .scheduler import async_get_scheduler
+from .snapshot import CoordinatorSnapshot
+from .usage import UsageCounters
+from .services import async_setup_services
 
 PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR, Platform.DEVICE_TRACKER]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Cudy Router services."""
+
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Cudy Router from a config entry."""
 
     data = entry.data
-    api = CudyRouter(hass, data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD])
-    coordinator = CudyRouterDataUpdateCoordinator(hass, entry, api)
-    await coordinator.async_config_entry_first_refresh()
+    api = CudyRouter(
+        hass,
+        data[CONF_HOST],
+        data[CONF_USERNAME],
+        data[CONF_PASSWORD],
+        _session_store(hass, entry),
+    )
+    if entry.options.get(OPTIONS_CAPTURE_RESPONSES):
+        api.capture = ResponseCapture()
+    await api.async_restore_session()
+    usage = UsageCounters(_usage_store(hass, entry))
+    await usage.async_load()
+    coordinator = CudyRouterDataUpdateCoordinator(
+        hass, entry, api, usage, CoordinatorSnapshot(_snapshot_store(hass, entry))
+    )
+    if await coordinator.async_restore_snapshot():
+        # The entities start from the saved data, the first poll runs meanwhile
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options have changed."""
+
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _session_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Storage of the router login session of the config entry."""
+
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.session")
+
+
+def _usage_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Storage of the data usage counters of the config entry."""
+
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.usage")
+
+
+def _snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Storage of the last data polled by the config entry."""
+
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot")
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: CudyRouterDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        async_get_scheduler(hass).release(entry.entry_id)
+        await coordinator.usage.async_save()
+        await coordinator.async_save_snapshot()
         if not hass.data[DOMAIN]:
             del hass.data[DOMAIN]
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted config entry."""
+
+    await _session_store(hass, entry).async_remove()
+    await _usage_store(hass, entry).async_remove()
+    await _snapshot_store(hass, entry).async_remove()
@@ -0,0 +1,125 @@
+"""Recent bandwidth statistics of the tracked devices."""
+from __future__ import annotations
+
+from array import array
+
+# Samples are grouped in buckets of this many seconds
+BUCKET_SECONDS = 10
+# Windows of the statistics, in seconds; the longest one sets the buffer size
+WINDOWS = (60, 300, 900)
+BUCKETS = max(WINDOWS) // BUCKET_SECONDS
+# Context of the bandwidth statistics in the coordinator changes
+BANDWIDTH_CONTEXT = "bandwidth"
+
+
+class RateWindow:
+    """Ring buffer of the speeds of a device in one direction.
+
+    Each bucket holds the sum, count and peak of its samples, in arrays of a
+    fixed size (BUCKETS), so the memory used per device does not depend on
+    the polling rate. The sums and counts of every window are kept up to
+    date as buckets enter and leave them, adding a sample is O(1); the peak
+    of a window is found from the peaks of its buckets.
+    """
+
+    __slots__ = ("_sums", "_counts", "_peaks", "_current", "_window_sums", "_window_counts")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._sums = array("d", bytes(8 * BUCKETS))
+        self._counts = array("I", bytes(4 * BUCKETS))
+        self._peaks = array("d", bytes(8 * BUCKETS))
+        # Absolute index of the newest bucket, None before the first sample
+        self._current: int | None = None
+        self._window_sums = array("d", bytes(8 * len(WINDOWS)))
+        self._window_counts = array("I", bytes(4 * len(WINDOWS)))
+
+    def _advance(self, bucket: int) -> None:
+        """Moves the newest bucket forward, dropping the buckets that leave the windows."""
+
+        if self._current is None or bucket - self._current >= BUCKETS:
+            # Nothing recent is left
+            for index in range(BUCKETS):
+                self._sums[index] = self._peaks[index] = 0.0
+                self._counts[index] = 0
+            for index in range(len(WINDOWS)):
+                self._window_sums[index] = 0.0
+                self._window_counts[index] = 0
+            self._current = bucket
+            return
+        while self._current < bucket:
+            self._current += 1
+            for index, window in enumerate(WINDOWS):
+                leaving = (self._current - window // BUCKET_SECONDS) % BUCKETS
+                self._window_counts[index] -= self._counts[leaving]
+                if self._window_counts[index]:
+                    self._window_sums[index] -= self._sums[leaving]
+                else:
+                    # No rounding errors left behind
+                    self._window_sums[index] = 0.0
+            slot = self._current % BUCKETS
+            self._sums[slot] = self._peaks[slot] = 0.0
+            self._counts[slot] = 0
+
+    def add(self, value: float, timestamp: float) -> None:
+        """Adds a sample taken at the given time."""
+
+        bucket = int(timestamp // BUCKET_SECONDS)
+        if self._current is not None and bucket < self._current:
+            # The clock went back, count the sample in the newest bucket
+            bucket = self._current
+        self._advance(bucket)
+        slot = bucket % BUCKETS
+        self._sums[slot] += value
+        self._counts[slot] += 1
+        if value > self._peaks[slot]:
+            self._peaks[slot] = value
+        for index in range(len(WINDOWS)):
+            self._window_sums[index] += value
+            self._window_counts[index] += 1
+
+    def average(self, window: int, timestamp: float) -> float | None:
+        """Returns the average of the samples of the window ending at the given time."""
+
+        self._advance_to(timestamp)
+        index = WINDOWS.index(window)
+        count = self._window_counts[index]
+        return self._window_sums[index] / count if count else None
+
+    def peak(self, window: int, timestamp: float) -> float | None:
+        """Returns the highest sample of the window ending at the given time."""
+
+        self._advance_to(timestamp)
+        if self._current is None:
+            return None
+        buckets = [
+            (self._current - offset) % BUCKETS for offset in range(window // BUCKET_SECONDS)
+        ]
+        if not any(self._counts[slot] for slot in buckets):
+            return None
+        return max(self._peaks[slot] for slot in buckets if self._counts[slot])
+
+    def _advance_to(self, timestamp: float) -> None:
+        """Drops the samples that are too old at the given time."""
+
+        if self._current is not None:
+            bucket = int(timestamp // BUCKET_SECONDS)
+            if bucket > self._current:
+                self._advance(bucket)
+
+
+class DeviceBandwidth:
+    """Upload and download speed statistics of a tracked device."""
+
+    __slots__ = ("upload", "download")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.upload = RateWindow()
+        self.download = RateWindow()
+
+    def add(self, up_speed: float | None, down_speed: float | None, timestamp: float) -> None:
+        """Adds the speeds of the device read in a poll."""
+
+        self.upload.add(up_speed or 0.0, timestamp)
+        self.download.add(down_speed or 0.0, timestamp)
@@ -10,21 +10,24 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
     MODULE_DEVICES,
     OPTIONS_DEVICELIST,
-    OPTIONS_PRESENCE_TIMEOUT,
-    OPTIONS_PRESENCE_SIGNAL_CHECK,
+    OPTIONS_DEVICES_ATTRIBUTE,
     SECTION_DETAILED,
     parse_device_entry,
 )
 from .coordinator import CudyRouterDataUpdateCoordinator
+from .entity import CudyRouterEntity, async_add_entities_batched
+from .models import ConnectionType, devices_attributes
+from .presence import PRESENCE_CONTEXT
+from .snapshot import STALE_CONTEXT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,23 +48,26 @@ async def async_setup_entry(
     device_list = device_list.replace("\n", ",")
     tracked_devices = [device.strip() for device in device_list.split(",") if device.strip()]
 
-    entities = []
+    # Add a binary sensor for "any device connected", and one for restored data
+    async_add_entities(
+        [
+            CudyRouterAnyDeviceConnectedSensor(coordinator),
+            CudyRouterStaleDataSensor(coordinator),
+        ]
+    )
 
     # Create a binary sensor for each tracked device
-    for device_entry in tracked_devices:
-        friendly_name, device_id = parse_device_entry(device_entry)
-        if device_id:
-            entities.append(CudyRouterDevicePresenceBinarySensor(coordinator, friendly_name, device_id))
+    await async_add_entities_batched(
+        async_add_entities,
+        (
+            CudyRouterDevicePresenceBinarySensor(coordinator, friendly_name, device_id)
+            for friendly_name, device_id in map(parse_device_entry, tracked_devices)
+            if device_id
+        ),
+    )
 
-    # Add a binary sensor for "any device connected"
-    entities.append(CudyRouterAnyDeviceConnectedSensor(coordinator))
 
-    async_add_entities(entities)
-
-
-class CudyRouterDevicePresenceBinarySensor(
-    CoordinatorEntity[CudyRouterDataUpdateCoordinator], BinarySensorEntity
-):
+class CudyRouterDevicePresenceBinarySensor(CudyRouterEntity, BinarySensorEntity):
     """Binary sensor for device presence on Cudy Router."""
 
     _attr_has_entity_name = True
@@ -71,7 +77,7 @@ class CudyRouterDevicePresenceBinarySensor(
         self, coordinator: CudyRouterDataUpdateCoordinator, friendly_name: str, device_id: str
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (PRESENCE_CONTEXT, device_id))
         self._friendly_name = friendly_name
         self._device_id = device_id
         self._attr_name = f"{friendly_name} connectivity"
@@ -86,47 +92,23 @@ class CudyRouterDevicePresenceBinarySensor(
             name=f"Cudy Router {coordinator.host}",
         )
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if device is connected."""
-        if not self.coordinator.data:
-            return False
-
-        devices_module = self.coordinator.data.get(MODULE_DEVICES, {})
-        detailed = devices_module.get(SECTION_DETAILED, {})
-        device = detailed.get(self._device_id)
-
-        if not device:
-            return False
-
-        # Get configuration options
-        config_entry = self.coordinator.config_entry
-        timeout = int(config_entry.options.get(OPTIONS_PRESENCE_TIMEOUT, 180))
-        signal_check = config_entry.options.get(OPTIONS_PRESENCE_SIGNAL_CHECK, True)
-        if isinstance(signal_check, str):
-            signal_check = signal_check.lower() == "true"
+    def _data_changed(self) -> bool:
+        """True if the presence or the attributes of the device have changed.
 
-        # Check last seen timestamp
-        last_seen = device.get("last_seen")
-        now_ts = datetime.now().timestamp()
-
-        if last_seen and (now_ts - last_seen) <= timeout:
-            connection = (device.get("connection") or "").lower()
-            signal = device.get("signal")
-
-            # Wired connections are always considered connected
-            if "wired" in connection:
-                return True
+        While the device is missing from the device list, the state is
+        written on every update for last_seen_seconds_ago.
+        """
 
-            # For wireless, check signal if enabled
-            if signal_check:
-                if signal and str(signal).strip() not in ("", "---", "None"):
-                    return True
-            else:
-                # If signal check disabled, just rely on timeout
-                return True
+        if super()._data_changed() or self.coordinator.device_changed(self._device_id):
+            return True
+        last_seen = self.coordinator.device_presence(self._device_id).last_seen
+        updated_at = self.coordinator.updated_at
+        return last_seen is not None and updated_at is not None and last_seen < updated_at
 
-        return False
+    @property
+    def is_on(self) -> bool:
+        """Return true if device is connected."""
+        return self.coordinator.device_presence(self._device_id).home
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -141,24 +123,22 @@ class CudyRouterDevicePresenceBinarySensor(
         if not device:
             return {"status": "not_found"}
 
-        last_seen = device.get("last_seen")
+        last_seen = device.last_seen
         now_ts = datetime.now().timestamp()
         seconds_since_seen = int(now_ts - last_seen) if last_seen else None
 
         return {
             "device_id": self._device_id,
-            "hostname": device.get("hostname", "Unknown"),
-            "ip_address": device.get("ip", "Unknown"),
-            "mac_address": device.get("mac", "Unknown"),
-            "signal_strength": device.get("signal", "---"),
-            "connection_type": device.get("connection", "Unknown"),
-            "upload_speed_mbps": device.get("up_speed", 0),
-            "download_speed_mbps": device.get("down_speed", 0),
-            "online_time": device.get("online", "---"),
+            "hostname": device.hostname,
+            "ip_address": device.ip,
+            "mac_address": device.mac,
+            "signal_strength": device.signal,
+            "connection_type": device.connection,
+            "upload_speed_mbps": device.up_speed,
+            "download_speed_mbps": device.down_speed,
+            "online_time": device.online,
             "last_seen_seconds_ago": seconds_since_seen,
-            "presence_timeout": int(
-                self.coordinator.config_entry.options.get(OPTIONS_PRESENCE_TIMEOUT, 180)
-            ),
+            "presence_timeout": self.coordinator.presence_engine.timeout,
         }
 
     @property
@@ -170,26 +150,26 @@ class CudyRouterDevicePresenceBinarySensor(
     def icon(self) -> str:
         """Return the icon to use in the frontend."""
         if self.is_on:
-            connection = self.extra_state_attributes.get("connection_type", "").lower()
-            if "wired" in connection:
+            devices_module = self.coordinator.data.get(MODULE_DEVICES, {})
+            device = devices_module.get(SECTION_DETAILED, {}).get(self._device_id)
+            if device.connection_type is ConnectionType.WIRED:
                 return "mdi:lan-connect"
-            elif "wifi" in connection or "2.4g" in connection or "5g" in connection:
+            elif device.connection_type.is_wireless:
                 return "mdi:wifi"
             return "mdi:check-network"
         return "mdi:close-network"
 
 
-class CudyRouterAnyDeviceConnectedSensor(
-    CoordinatorEntity[CudyRouterDataUpdateCoordinator], BinarySensorEntity
-):
+class CudyRouterAnyDeviceConnectedSensor(CudyRouterEntity, BinarySensorEntity):
     """Binary sensor that shows if any devices are connected to the router."""
 
     _attr_has_entity_name = True
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _unrecorded_attributes = frozenset({"devices"})
 
     def __init__(self, coordinator: CudyRouterDataUpdateCoordinator) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (MODULE_DEVICES, "connected_devices"))
         self._attr_name = "any device connected"
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_any_device_connected"
         self._attr_device_info = DeviceInfo(
@@ -226,18 +206,15 @@ class CudyRouterAnyDeviceConnectedSensor(
         return {
             "total_devices": device_count,
             "wired_devices": sum(
-                1
-                for d in devices
-                if "wired" in (d.get("connection") or "").lower()
+                1 for d in devices if d.connection_type is ConnectionType.WIRED
             ),
             "wireless_devices": sum(
-                1
-                for d in devices
-                if "wifi" in (d.get("connection") or "").lower()
-                or "2.4g" in (d.get("connection") or "").lower()
-                or "5g" in (d.get("connection") or "").lower()
+                1 for d in devices if d.connection_type.is_wireless
+            ),
+            **devices_attributes(
+                devices,
+                self.coordinator.config_entry.options.get(OPTIONS_DEVICES_ATTRIBUTE),
             ),
-            "devices": devices,
         }
 
     @property
@@ -251,3 +228,31 @@ class CudyRouterAnyDeviceConnectedSensor(
         if self.is_on:
             return "mdi:devices"
         return "mdi:devices-off"
+
+
+class CudyRouterStaleDataSensor(CudyRouterEntity, BinarySensorEntity):
+    """Binary sensor that is on while the entities show the data saved by a previous run.
+
+    The data is restored when Home Assistant starts and replaced by the
+    first successful poll of the router.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:history"
+
+    def __init__(self, coordinator: CudyRouterDataUpdateCoordinator) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, STALE_CONTEXT)
+        self._attr_name = "stale data"
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_stale_data"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
+            manufacturer="Cudy",
+            name=f"Cudy Router {coordinator.host}",
+        )
+
+    @property
+    def is_on(self) -> bool:
+        """Return true until the router has been polled."""
+        return self.coordinator.stale
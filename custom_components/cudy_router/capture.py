@@ -0,0 +1,195 @@
+"""Capture of the raw responses of a Cudy router for the diagnostics."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+import re
+import time
+from typing import Any
+
+# Responses kept per endpoint
+CAPTURE_PER_ENDPOINT = 5
+# Characters kept for all the endpoints together, the oldest responses are dropped
+CAPTURE_MAX_SIZE = 2 * 1024 * 1024
+
+REDACTED = "**REDACTED**"
+# Values of the session cookie, the login and CSRF tokens and the passwords
+_SECRET_PATTERNS = (
+    re.compile(r"(sysauth=)[^;\s\"'&]+", re.IGNORECASE),
+    re.compile(r"(;stok=)[^/\s\"'&]+", re.IGNORECASE),
+    re.compile(
+        r"""(name=["']?(?:_csrf|token|salt|luci_password|password)["']?[^>]*?"""
+        r"""value=["']?)[^"'\s>]*""",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"""(["']?(?:_csrf|token|password|passwd|key)["']?\s*[:=]\s*["'])[^"']*""",
+        re.IGNORECASE,
+    ),
+)
+# Personal data of the pages (see Anonymizer)
+MAC_PATTERN = re.compile(r"\b[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}\b")
+IPV4_PATTERN = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
+LONG_NUMBER_PATTERN = re.compile(r"\b\d{14,22}\b")
+TOKEN_PATTERN = re.compile(r"((?:_csrf|token|stok|sysauth)[\"']?\s*[=:]\s*[\"']?)[0-9A-Za-z]{8,}")
+HOSTNAME_CELL_PATTERN = re.compile(
+    r'(<div id="cbi-table-\d+-hostname">)(.*?)(</div>)', re.DOTALL
+)
+HOSTNAME_TEXT_PATTERN = re.compile(r"(</span>\s*|<p class=\"hidden-xs\">)([^<]+)")
+# Response headers worth keeping, cookies are left out
+_KEPT_HEADERS = ("Content-Type", "Content-Encoding", "Content-Length", "Transfer-Encoding")
+
+
+def redact(text: str) -> str:
+    """Replaces the session cookies, tokens and passwords found in a page."""
+
+    for pattern in _SECRET_PATTERNS:
+        text = pattern.sub(rf"\g<1>{REDACTED}", text)
+    return text
+
+
+class _Placeholders(dict):
+    """Gives every distinct value the same placeholder."""
+
+    def __init__(self, template: Callable[[int], str]) -> None:
+        super().__init__()
+        self._template = template
+
+    def __missing__(self, key: str) -> str:
+        value = self[key] = self._template(len(self))
+        return value
+
+
+class Anonymizer:
+    """Replaces the personal data of the router pages by placeholders.
+
+    MAC and IP addresses, the hostnames of the device list, IMEI/ICCID like
+    numbers and the session tokens are replaced. A value gets the same
+    placeholder in every page anonymized by the same instance, so a client
+    can still be followed from one response to the next.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.macs = _Placeholders(
+            lambda i: f"02:00:00:{i >> 16 & 255:02X}:{i >> 8 & 255:02X}:{i & 255:02X}"
+        )
+        self.ips = _Placeholders(lambda i: f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+        self.hostnames = _Placeholders(lambda i: f"host-{i}")
+
+    def device_id(self, device_id: str) -> str:
+        """Returns the placeholder of a tracked device's MAC address or hostname."""
+
+        if MAC_PATTERN.fullmatch(device_id):
+            return self.macs[device_id.upper()]
+        return self.hostnames[device_id.strip()]
+
+    def anonymize(self, page: str) -> str:
+        """Returns the page without personal data."""
+
+        def hostname_cell(match: re.Match[str]) -> str:
+            text = HOSTNAME_TEXT_PATTERN.sub(
+                lambda m: f"{m[1]}{self.hostnames[m[2].strip()]}", match[2]
+            )
+            return f"{match[1]}{text}{match[3]}"
+
+        page = HOSTNAME_CELL_PATTERN.sub(hostname_cell, page)
+        page = MAC_PATTERN.sub(lambda m: self.macs[m[0].upper()], page)
+        page = IPV4_PATTERN.sub(lambda m: self.ips[m[0]], page)
+        page = LONG_NUMBER_PATTERN.sub(lambda m: "0" * len(m[0]), page)
+        return TOKEN_PATTERN.sub(lambda m: f"{m[1]}{'0' * 32}", page)
+
+
+@dataclass(slots=True)
+class CapturedResponse:
+    """A response of the router, redacted."""
+
+    endpoint: str
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: str
+    elapsed_ms: float
+    # Wall clock time of the response
+    time: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the response as listed in the diagnostics."""
+
+        return {
+            "endpoint": self.endpoint,
+            "url": self.url,
+            "status": self.status,
+            "headers": self.headers,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "time": self.time,
+            "body": self.body,
+        }
+
+
+class ResponseCapture:
+    """Ring buffer of the last responses of every endpoint.
+
+    Only enabled with the capture_responses option, as it keeps whole pages
+    in memory. Both the number of responses and their total size are capped.
+    """
+
+    def __init__(
+        self, per_endpoint: int = CAPTURE_PER_ENDPOINT, max_size: int = CAPTURE_MAX_SIZE
+    ) -> None:
+        """Initialize."""
+        self.per_endpoint = per_endpoint
+        self.max_size = max_size
+        self.size = 0
+        self.dropped = 0
+        self._responses: dict[str, deque[CapturedResponse]] = {}
+
+    def add(
+        self,
+        endpoint: str,
+        url: str,
+        status: int,
+        headers: Any,
+        body: str,
+        elapsed_ms: float,
+    ) -> None:
+        """Adds a response, dropping the oldest ones beyond the limits."""
+
+        if len(body) > self.max_size:
+            self.dropped += 1
+            return
+        host_end = url.find("/cgi-bin/")
+        response = CapturedResponse(
+            endpoint=endpoint,
+            url=redact(url[host_end:] if host_end >= 0 else url),
+            status=status,
+            headers={name: headers[name] for name in _KEPT_HEADERS if name in headers},
+            body=redact(body),
+            elapsed_ms=elapsed_ms,
+            time=time.time(),
+        )
+        responses = self._responses.setdefault(endpoint, deque())
+        if len(responses) >= self.per_endpoint:
+            self._drop(responses)
+        responses.append(response)
+        self.size += len(response.body)
+        while self.size > self.max_size:
+            self._drop(min(
+                (queue for queue in self._responses.values() if queue),
+                key=lambda queue: queue[0].time,
+            ))
+
+    def _drop(self, responses: deque[CapturedResponse]) -> None:
+        """Drops the oldest response of an endpoint."""
+
+        self.size -= len(responses.popleft().body)
+        self.dropped += 1
+
+    def responses(self) -> list[CapturedResponse]:
+        """Returns the captured responses, oldest first."""
+
+        return sorted(
+            (response for queue in self._responses.values() for response in queue),
+            key=lambda response: response.time,
+        )
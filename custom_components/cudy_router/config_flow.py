@@ -20,7 +20,29 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
 
 from .router import CudyRouter
-from .const import DOMAIN, OPTIONS_DEVICELIST, OPTIONS_PRESENCE_TIMEOUT, OPTIONS_PRESENCE_SIGNAL_CHECK
+from .const import (
+    DEFAULT_BURST_SCAN_INTERVAL,
+    DEFAULT_DISCOVERY_TIMEOUT,
+    DEFAULT_MODEM_SCAN_INTERVAL,
+    DEVICES_ATTRIBUTE_COMPACT,
+    DEVICES_ATTRIBUTE_FULL,
+    DEVICES_ATTRIBUTE_NONE,
+    DOMAIN,
+    OPTIONS_BURST_SCAN_INTERVAL,
+    OPTIONS_CAPTURE_RESPONSES,
+    OPTIONS_DEVICELIST,
+    OPTIONS_DEVICES_ATTRIBUTE,
+    OPTIONS_DISCOVER_CLIENTS,
+    OPTIONS_DISCOVERY_TIMEOUT,
+    OPTIONS_MODEM_SCAN_INTERVAL,
+    OPTIONS_PARSER_ENGINE,
+    PARSER_ENGINE_AUTO,
+    PARSER_ENGINE_HTML_PARSER,
+    PARSER_ENGINE_LXML,
+    PARSER_ENGINE_SELECTOLAX,
+    OPTIONS_PRESENCE_TIMEOUT,
+    OPTIONS_PRESENCE_SIGNAL_CHECK,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,9 +60,11 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]):
     """Validate user input after configuration."""
 
     router = CudyRouter(hass, data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD])
-
-    if not await hass.async_add_executor_job(router.authenticate):
-        raise InvalidAuth
+    try:
+        if not await router.authenticate():
+            raise InvalidAuth
+    finally:
+        router.close()
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -105,15 +129,38 @@ class CudyRouterOptionsFlowHandler(config_entries.OptionsFlow):
             logging.debug("user_input: %s", user_input)
             device_list = user_input.get(OPTIONS_DEVICELIST) or ""
             scan_interval = user_input.get(CONF_SCAN_INTERVAL) or 15
+            modem_scan_interval = (
+                user_input.get(OPTIONS_MODEM_SCAN_INTERVAL) or DEFAULT_MODEM_SCAN_INTERVAL
+            )
+            burst_scan_interval = user_input.get(OPTIONS_BURST_SCAN_INTERVAL)
+            if burst_scan_interval is None:
+                burst_scan_interval = DEFAULT_BURST_SCAN_INTERVAL
             presence_timeout = user_input.get(OPTIONS_PRESENCE_TIMEOUT) or 180
             presence_signal_check = user_input.get(OPTIONS_PRESENCE_SIGNAL_CHECK)
             if presence_signal_check is None:
                 presence_signal_check = True
+            parser_engine = user_input.get(OPTIONS_PARSER_ENGINE) or PARSER_ENGINE_AUTO
+            devices_attribute = (
+                user_input.get(OPTIONS_DEVICES_ATTRIBUTE) or DEVICES_ATTRIBUTE_FULL
+            )
 
             options[OPTIONS_DEVICELIST] = device_list
             options[CONF_SCAN_INTERVAL] = scan_interval
+            options[OPTIONS_MODEM_SCAN_INTERVAL] = modem_scan_interval
+            options[OPTIONS_BURST_SCAN_INTERVAL] = burst_scan_interval
             options[OPTIONS_PRESENCE_TIMEOUT] = presence_timeout
             options[OPTIONS_PRESENCE_SIGNAL_CHECK] = presence_signal_check
+            options[OPTIONS_PARSER_ENGINE] = parser_engine
+            options[OPTIONS_DEVICES_ATTRIBUTE] = devices_attribute
+            options[OPTIONS_DISCOVER_CLIENTS] = bool(
+                user_input.get(OPTIONS_DISCOVER_CLIENTS)
+            )
+            options[OPTIONS_DISCOVERY_TIMEOUT] = (
+                user_input.get(OPTIONS_DISCOVERY_TIMEOUT) or DEFAULT_DISCOVERY_TIMEOUT
+            )
+            options[OPTIONS_CAPTURE_RESPONSES] = bool(
+                user_input.get(OPTIONS_CAPTURE_RESPONSES)
+            )
 
             # Save if there's no errors, else fall through and show the form again
             if not errors:
@@ -144,6 +191,51 @@ class CudyRouterOptionsFlowHandler(config_entries.OptionsFlow):
                             step=5,
                         ),
                     ),
+                    vol.Optional(
+                        OPTIONS_MODEM_SCAN_INTERVAL,
+                        default=options.get(OPTIONS_MODEM_SCAN_INTERVAL)
+                        or DEFAULT_MODEM_SCAN_INTERVAL,
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="seconds",
+                            min=5,
+                            max=60 * 60,
+                            step=5,
+                        ),
+                    ),
+                    vol.Optional(
+                        OPTIONS_BURST_SCAN_INTERVAL,
+                        default=options.get(
+                            OPTIONS_BURST_SCAN_INTERVAL, DEFAULT_BURST_SCAN_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="seconds",
+                            min=0,
+                            max=60,
+                            step=1,
+                        ),
+                    ),
+                    vol.Optional(
+                        OPTIONS_DISCOVER_CLIENTS,
+                        default=options.get(OPTIONS_DISCOVER_CLIENTS, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        OPTIONS_DISCOVERY_TIMEOUT,
+                        default=options.get(
+                            OPTIONS_DISCOVERY_TIMEOUT, DEFAULT_DISCOVERY_TIMEOUT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="seconds",
+                            min=300,
+                            max=30 * 24 * 60 * 60,
+                            step=60,
+                        ),
+                    ),
                     vol.Optional(
                         OPTIONS_PRESENCE_TIMEOUT,
                         default=options.get(OPTIONS_PRESENCE_TIMEOUT, 180),
@@ -160,6 +252,39 @@ class CudyRouterOptionsFlowHandler(config_entries.OptionsFlow):
                         OPTIONS_PRESENCE_SIGNAL_CHECK,
                         default=options.get(OPTIONS_PRESENCE_SIGNAL_CHECK, True),
                     ): selector.BooleanSelector(),
+                    vol.Optional(
+                        OPTIONS_PARSER_ENGINE,
+                        default=options.get(OPTIONS_PARSER_ENGINE, PARSER_ENGINE_AUTO),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                PARSER_ENGINE_AUTO,
+                                PARSER_ENGINE_HTML_PARSER,
+                                PARSER_ENGINE_LXML,
+                                PARSER_ENGINE_SELECTOLAX,
+                            ],
+                            translation_key=OPTIONS_PARSER_ENGINE,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        ),
+                    ),
+                    vol.Optional(
+                        OPTIONS_DEVICES_ATTRIBUTE,
+                        default=options.get(OPTIONS_DEVICES_ATTRIBUTE, DEVICES_ATTRIBUTE_FULL),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                DEVICES_ATTRIBUTE_FULL,
+                                DEVICES_ATTRIBUTE_COMPACT,
+                                DEVICES_ATTRIBUTE_NONE,
+                            ],
+                            translation_key=OPTIONS_DEVICES_ATTRIBUTE,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        ),
+                    ),
+                    vol.Optional(
+                        OPTIONS_CAPTURE_RESPONSES,
+                        default=options.get(OPTIONS_CAPTURE_RESPONSES, False),
+                    ): selector.BooleanSelector(),
                 }
             ),
             errors=errors,
@@ -2,15 +2,47 @@
 
 DOMAIN = "cudy_router"
 
+STORAGE_VERSION = 1
+
 MODULE_MODEM = "modem"
 MODULE_DEVICES = "devices"
 
 SECTION_DETAILED = "detailed"
 
+OPTIONS_BURST_SCAN_INTERVAL = "burst_scan_interval"
+OPTIONS_CAPTURE_RESPONSES = "capture_responses"
 OPTIONS_DEVICELIST = "device_list"
+OPTIONS_DISCOVER_CLIENTS = "discover_clients"
+OPTIONS_DISCOVERY_TIMEOUT = "discovery_timeout"
+OPTIONS_DEVICES_ATTRIBUTE = "devices_attribute"
+OPTIONS_MODEM_SCAN_INTERVAL = "modem_scan_interval"
+OPTIONS_PARSER_ENGINE = "parser_engine"
 OPTIONS_PRESENCE_TIMEOUT = "presence_timeout"
 OPTIONS_PRESENCE_SIGNAL_CHECK = "presence_signal_check"
 
+PARSER_ENGINE_AUTO = "auto"
+PARSER_ENGINE_HTML_PARSER = "html_parser"
+PARSER_ENGINE_LXML = "lxml"
+PARSER_ENGINE_SELECTOLAX = "selectolax"
+
+DEVICES_ATTRIBUTE_FULL = "full"
+DEVICES_ATTRIBUTE_COMPACT = "compact"
+DEVICES_ATTRIBUTE_NONE = "none"
+# Devices listed in the compact devices attribute
+COMPACT_DEVICES_LIMIT = 50
+
+# Seconds after which a discovered client that is not seen any more is removed
+DEFAULT_DISCOVERY_TIMEOUT = 24 * 60 * 60
+# Discovered clients, the least recently seen ones are removed beyond it
+DISCOVERY_MAX_CLIENTS = 200
+
+SERVICE_GET_CONNECTED_DEVICES = "get_connected_devices"
+
+DEFAULT_SCAN_INTERVAL = 15
+DEFAULT_MODEM_SCAN_INTERVAL = 60
+# Scan interval while the presence of a tracked device may be changing, 0 disables it
+DEFAULT_BURST_SCAN_INTERVAL = 5
+
 
 def parse_device_entry(entry: str) -> tuple[str, str]:
     """Parse device entry: FriendlyName=MAC or just MAC.
@@ -1,48 +1,403 @@
 """Coordinator for Cudy Router integration."""
+import asyncio
 from datetime import timedelta
 import logging
+import time
 from typing import Any
 
 import async_timeout
 
 from homeassistant.const import CONF_HOST, CONF_SCAN_INTERVAL
 
-from .router import CudyRouter
+from .router import CudyRouter, RouterUnavailable
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .const import (
+    DEFAULT_BURST_SCAN_INTERVAL,
+    DEFAULT_DISCOVERY_TIMEOUT,
+    DISCOVERY_MAX_CLIENTS,
+    DEFAULT_MODEM_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MODULE_DEVICES,
+    MODULE_MODEM,
+    OPTIONS_BURST_SCAN_INTERVAL,
+    OPTIONS_DISCOVER_CLIENTS,
+    OPTIONS_DISCOVERY_TIMEOUT,
+    OPTIONS_MODEM_SCAN_INTERVAL,
+    SECTION_DETAILED,
+)
+from .bandwidth import BANDWIDTH_CONTEXT, DeviceBandwidth
+from .discovery import DISCOVERY_CONTEXT, ClientDiscovery
+from .metrics import METRIC_ENTITY_UPDATE
+from .models import DeviceRecord
+from .presence import NOT_FOUND, PRESENCE_CONTEXT, DevicePresence, PresenceEngine
+from .scheduler import async_get_scheduler
+from .snapshot import STALE_CONTEXT, CoordinatorSnapshot
+from .usage import ROUTER_TOTAL, USAGE_CONTEXT, UsageCounters
 
 _LOGGER = logging.getLogger(__name__)
 
+# Option and default value of the polling interval of each module
+MODULE_SCAN_INTERVALS = {
+    MODULE_DEVICES: (CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+    MODULE_MODEM: (OPTIONS_MODEM_SCAN_INTERVAL, DEFAULT_MODEM_SCAN_INTERVAL),
+}
+# Updates may run slightly earlier than scheduled, a module is due within this margin
+SCHEDULE_TOLERANCE = 1
+# Seconds of burst polling after the presence of a tracked device has changed
+BURST_HOLD = 60
+# Seconds a poll may take, its requests in flight are cancelled afterwards
+POLL_TIMEOUT = 30
+
+
+def changed_keys(
+    previous: dict[str, Any] | None, data: dict[str, Any]
+) -> set[tuple[str, ...]] | None:
+    """Returns the keys of the data that differ between two updates.
+
+    Keys are (module, sensor) for the module sensors and
+    (SECTION_DETAILED, device_id, field) for the tracked devices. The
+    last_seen timestamps are left out, they change on every poll.
+    Returns None if there is no previous data to compare with.
+    """
+
+    if previous is None:
+        return None
+    changed: set[tuple[str, ...]] = set()
+    for module in previous.keys() | data.keys():
+        old_module = previous.get(module) or {}
+        new_module = data.get(module) or {}
+        if old_module is new_module:
+            # Module not fetched in this update
+            continue
+        for key in old_module.keys() | new_module.keys():
+            old_value = old_module.get(key)
+            new_value = new_module.get(key)
+            if key == SECTION_DETAILED:
+                changed.update(_changed_devices(old_value or {}, new_value or {}))
+            elif old_value != new_value:
+                changed.add((module, key))
+    return changed
+
+
+def _changed_devices(
+    previous: dict[str, DeviceRecord], devices: dict[str, DeviceRecord]
+) -> set[tuple[str, ...]]:
+    """Returns the changed fields of the tracked devices."""
+
+    changed: set[tuple[str, ...]] = set()
+    for device_id in previous.keys() | devices.keys():
+        old_device = previous.get(device_id)
+        new_device = devices.get(device_id)
+        if old_device is new_device:
+            continue
+        for field in DeviceRecord.__slots__:
+            if field != "last_seen" and getattr(old_device, field, None) != getattr(
+                new_device, field, None
+            ):
+                changed.add((SECTION_DETAILED, device_id, field))
+    return changed
+
 
 class CudyRouterDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Get the latest data from the router."""
+    """Get the latest data from the router.
+
+    Every module has its own polling interval. The coordinator runs at the
+    shortest one and each update fetches only the modules that are due.
+
+    The keys changed by the last update are kept in changed, entities use
+    them to skip writing a state that is the same as before. The presence
+    of the tracked devices is evaluated once per update for all platforms.
+
+    The polls of the routers are spread over the interval and limited by
+    the scheduler shared by all the config entries (see FleetScheduler).
+    While the presence of a tracked device may be changing, the device list
+    is polled at the shorter burst interval until it has settled. The
+    speeds of the tracked devices are kept for the bandwidth statistics and
+    integrated into the data usage counters.
+
+    The last data is saved to the disk (see CoordinatorSnapshot). Restored
+    when the entry is set up, it is stale until the first successful poll.
+    """
 
     config_entry: ConfigEntry
 
     def __init__(
-        self, hass: HomeAssistant, entry: ConfigEntry, api: CudyRouter
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: CudyRouter,
+        usage: UsageCounters | None = None,
+        snapshot: CoordinatorSnapshot | None = None,
     ) -> None:
         """Initialize router data."""
         self.hass = hass
         self.config_entry = entry
         self.host: str = entry.data[CONF_HOST]
         self.api = api
-        scan_interval = (entry.options and entry.options.get(CONF_SCAN_INTERVAL)) or 15
+        # Data transferred by the tracked devices and through the router
+        self.usage = usage or UsageCounters()
+        # Last data saved to the disk, and wall clock time of that data
+        self.snapshot = snapshot or CoordinatorSnapshot()
+        self.updated_at: float | None = None
+        # The data was restored from the snapshot and not polled yet
+        self.stale = False
+        # A poll has succeeded since the entry was set up
+        self._polled = False
+        options = entry.options or {}
+        self.module_intervals: dict[str, int] = {
+            module: int(options.get(option) or default)
+            for module, (option, default) in MODULE_SCAN_INTERVALS.items()
+        }
+        # Monotonic time when each module should be fetched again
+        self._module_due: dict[str, float] = {}
+        # Keys changed by the last update, None if everything may have changed
+        self.changed: set[tuple[str, ...]] | None = None
+        self.presence_engine = PresenceEngine(options)
+        self.presence: dict[str, DevicePresence] = {}
+        burst_interval = options.get(OPTIONS_BURST_SCAN_INTERVAL)
+        if burst_interval is None:
+            burst_interval = DEFAULT_BURST_SCAN_INTERVAL
+        # Interval of the device list polls while presence may be changing
+        self.burst_interval = (
+            timedelta(seconds=int(burst_interval)) if burst_interval else None
+        )
+        # Monotonic time until which the burst lasts after a presence change
+        self._burst_until = 0.0
+        # A tracked device still home was missing from the last device list
+        self._presence_pending = False
+        # Recent speeds of the tracked devices
+        self.bandwidth: dict[str, DeviceBandwidth] = {}
+        # Every other client of the router, if enabled
+        self.discovery: ClientDiscovery | None = None
+        if options.get(OPTIONS_DISCOVER_CLIENTS):
+            self.discovery = ClientDiscovery(
+                int(options.get(OPTIONS_DISCOVERY_TIMEOUT) or DEFAULT_DISCOVERY_TIMEOUT),
+                DISCOVERY_MAX_CLIENTS,
+                self.presence_engine.timeout,
+            )
+        self.scheduler = async_get_scheduler(hass)
+        interval = min(self.module_intervals.values())
+        self._interval = timedelta(seconds=interval)
+        # The first scheduled poll is delayed by the phase of the entry, the
+        # next ones keep the offset from the other routers
+        self.phase = self.scheduler.phase(entry.entry_id, interval)
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN} - {self.host}",
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=self._interval + timedelta(seconds=self.phase),
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restores the data saved by a previous run, returns False if there is none.
+
+        The presence of the tracked devices is evaluated from their saved
+        last_seen timestamps, so they are not away while the first poll runs.
+        """
+
+        restored = await self.snapshot.async_load()
+        if restored is None:
+            return False
+        data, self.updated_at = restored
+        self.data = data
+        self.stale = True
+        self._update_presence(data, self.updated_at)
+        return True
+
+    async def async_save_snapshot(self) -> None:
+        """Writes the last data to the disk now (e.g. before the entry is reloaded)."""
+
+        if self.data is not None and self.updated_at is not None:
+            await self.snapshot.async_save(self.data, self.updated_at)
+
+    def _due_modules(self) -> list[str]:
+        """Returns the modules to be fetched now and schedules their next fetch."""
+
+        now = time.monotonic()
+        due = [
+            module
+            for module, interval in self.module_intervals.items()
+            if now + SCHEDULE_TOLERANCE >= self._module_due.get(module, 0)
+            or (module == MODULE_DEVICES and self.bursting)
+        ]
+        for module in due:
+            self._module_due[module] = now + self.module_intervals[module]
+        return due
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notifies the entities of an update, recording the time it takes."""
+
+        with self.api.metrics.timer(METRIC_ENTITY_UPDATE):
+            super().async_update_listeners()
+
+    @property
+    def bursting(self) -> bool:
+        """True while the device list is polled at the burst interval.
+
+        That is while a tracked device has just arrived or left, or is
+        missing from the device list but not away yet.
+        """
+
+        return self.burst_interval is not None and (
+            self._presence_pending or time.monotonic() < self._burst_until
         )
 
+    def has_changed(self, context: Any) -> bool:
+        """True if the data of the given context changed in the last update."""
+
+        return context is None or self.changed is None or context in self.changed
+
+    def device_changed(self, device_id: str) -> bool:
+        """True if a field of the tracked device changed in the last update.
+
+        The last_seen timestamp is left out (see changed_keys).
+        """
+
+        return self.changed is None or any(
+            (SECTION_DETAILED, device_id, field) in self.changed
+            for field in DeviceRecord.__slots__
+        )
+
+    def device_presence(self, device_id: str) -> DevicePresence:
+        """Returns the presence of a tracked device evaluated in the last update."""
+
+        return self.presence.get(device_id, NOT_FOUND)
+
+    def _update_presence(
+        self, data: dict[str, Any], polled_at: float | None = None
+    ) -> None:
+        """Evaluates the presence of the tracked devices and records the changes.
+
+        The device list polled at the given wall clock time tells which
+        devices are still pending (see PresenceEngine.pending).
+        """
+
+        detailed = (data.get(MODULE_DEVICES) or {}).get(SECTION_DETAILED) or {}
+        presence = self.presence_engine.evaluate(detailed)
+        changed = {
+            (PRESENCE_CONTEXT, device_id)
+            for device_id in presence.keys() | self.presence.keys()
+            if presence.get(device_id, NOT_FOUND).home
+            != self.presence.get(device_id, NOT_FOUND).home
+        }
+        if self.changed is not None:
+            self.changed.update(changed)
+            if changed:
+                self._burst_until = time.monotonic() + BURST_HOLD
+        if polled_at is not None:
+            self._presence_pending = self.presence_engine.pending(presence, polled_at)
+        self.presence = presence
+
+    def _update_bandwidth(self, data: dict[str, Any], polled_at: float) -> None:
+        """Adds the speeds of the tracked devices seen in the poll to their statistics."""
+
+        detailed = (data.get(MODULE_DEVICES) or {}).get(SECTION_DETAILED) or {}
+        for device_id, device in detailed.items():
+            if device.last_seen is None or device.last_seen < polled_at:
+                # Not in the device list this time
+                continue
+            if (bandwidth := self.bandwidth.get(device_id)) is None:
+                bandwidth = self.bandwidth[device_id] = DeviceBandwidth()
+            bandwidth.add(device.up_speed, device.down_speed, polled_at)
+        if self.changed is not None:
+            # The windows move on even for the devices that were not seen
+            self.changed.update((BANDWIDTH_CONTEXT, device_id) for device_id in self.bandwidth)
+
+    def _update_usage(self, data: dict[str, Any], polled_at: float) -> None:
+        """Counts the data transferred since the previous poll."""
+
+        devices_data = data.get(MODULE_DEVICES) or {}
+        counted: set[str] = set()
+        for device_id, device in (devices_data.get(SECTION_DETAILED) or {}).items():
+            if device.last_seen is None or device.last_seen < polled_at:
+                self.usage.missed(device_id)
+            elif self.usage.add(device_id, device.up_speed, device.down_speed, polled_at):
+                counted.add(device_id)
+        if self.usage.add(
+            ROUTER_TOTAL,
+            (devices_data.get("total_up_speed") or {}).get("value"),
+            (devices_data.get("total_down_speed") or {}).get("value"),
+            polled_at,
+        ):
+            counted.add(ROUTER_TOTAL)
+        if counted:
+            self.usage.save()
+            if self.changed is not None:
+                self.changed.update((USAGE_CONTEXT, key) for key in counted)
+
+    def _update_discovery(self, data: dict[str, Any], polled_at: float) -> None:
+        """Records the clients of the device list that are not tracked."""
+
+        devices_data = data.get(MODULE_DEVICES) or {}
+        devices = (
+            (devices_data.get("connected_devices") or {}).get("attributes", {}).get("devices")
+        ) or []
+        tracked = {
+            device.mac for device in (devices_data.get(SECTION_DETAILED) or {}).values()
+        }
+        changed = self.discovery.update(devices, tracked, polled_at)
+        if self.changed is not None:
+            self.changed.update((DISCOVERY_CONTEXT, mac) for mac in changed)
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Get the latest data from the router."""
-        async with async_timeout.timeout(30):
+        if self._polled:
+            self.update_interval = self._interval
+        # Nothing changes if the update fails, entities follow the availability
+        self.changed = set()
+        async with self.scheduler.fetch_slot():
+            # Only the modules due once the slot is free are fetched
+            modules = self._due_modules()
+            polled_at = time.time()
             try:
-                return await self.api.get_data(self.hass, self.config_entry.options, self.data)
-            except Exception as err:
-                raise UpdateFailed from err
+                async with async_timeout.timeout(POLL_TIMEOUT):
+                    try:
+                        data = await self.api.get_data(
+                            self.hass, self.config_entry.options, self.data, modules
+                        )
+                    except RouterUnavailable as err:
+                        # Report the paused state instead of trying the dead host again
+                        raise UpdateFailed(str(err)) from err
+                    except Exception as err:
+                        raise UpdateFailed from err
+            except asyncio.TimeoutError as err:
+                # The cancelled requests are not failures of their own, the
+                # router not answering in time is (see CircuitBreaker)
+                self.api.breaker.record_failure()
+                raise UpdateFailed(
+                    f"Timeout polling {self.host} after {POLL_TIMEOUT} seconds"
+                ) from err
+        self.changed = changed_keys(self.data, data)
+        # A device list that could not be fetched is carried over from the
+        # previous data, its speeds must not be counted again
+        devices_fetched = MODULE_DEVICES in modules and data.get(MODULE_DEVICES) is not (
+            self.data or {}
+        ).get(MODULE_DEVICES)
+        if devices_fetched:
+            self._update_presence(data, polled_at)
+            self._update_bandwidth(data, polled_at)
+            self._update_usage(data, polled_at)
+            if self.discovery is not None:
+                self._update_discovery(data, polled_at)
+        else:
+            self._update_presence(data)
+        if self._polled:
+            self.update_interval = (
+                self.burst_interval
+                if self.bursting and self.burst_interval < self._interval
+                else self._interval
+            )
+        self._polled = True
+        if self.stale:
+            self.stale = False
+            if self.changed is not None:
+                self.changed.add(STALE_CONTEXT)
+        self.updated_at = polled_at
+        self.snapshot.save(lambda: (self.data, self.updated_at))
+        return data
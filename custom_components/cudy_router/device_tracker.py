@@ -2,25 +2,27 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+import time
 from typing import Any
 
-from homeassistant.components.device_tracker import SourceType, TrackerEntity
+from homeassistant.components.device_tracker import ScannerEntity, SourceType, TrackerEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
     MODULE_DEVICES,
     OPTIONS_DEVICELIST,
-    OPTIONS_PRESENCE_TIMEOUT,
-    OPTIONS_PRESENCE_SIGNAL_CHECK,
     SECTION_DETAILED,
     parse_device_entry,
 )
 from .coordinator import CudyRouterDataUpdateCoordinator
+from .discovery import DISCOVERY_CONTEXT, DiscoveredClient
+from .entity import CudyRouterEntity, async_add_entities_batched
+from .presence import PRESENCE_CONTEXT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,18 +37,96 @@ async def async_setup_entry(
     # Support both comma and newline separated values
     device_list = device_list.replace("\n", ",")
     tracked_devices = [device.strip() for device in device_list.split(",") if device.strip()]
-    entities = []
-    for device_entry in tracked_devices:
-        friendly_name, device_id = parse_device_entry(device_entry)
-        if device_id:
-            entities.append(CudyRouterDeviceTracker(coordinator, friendly_name, device_id))
-    async_add_entities(entities)
-
-class CudyRouterDeviceTracker(CoordinatorEntity, TrackerEntity):
+    await async_add_entities_batched(
+        async_add_entities,
+        (
+            CudyRouterDeviceTracker(coordinator, friendly_name, device_id)
+            for friendly_name, device_id in map(parse_device_entry, tracked_devices)
+            if device_id
+        ),
+    )
+
+    if coordinator.discovery is not None:
+        tracked_ids = {device_id for _, device_id in map(parse_device_entry, tracked_devices)}
+        _async_setup_discovery(
+            hass, config_entry, coordinator, async_add_entities, tracked_ids
+        )
+    else:
+        # Trackers left by a previous run with the discovery turned on
+        registry = er.async_get(hass)
+        for entity_id in _async_client_entities(registry, config_entry).values():
+            registry.async_remove(entity_id)
+
+
+def _client_unique_id(config_entry: ConfigEntry, mac: str) -> str:
+    """Unique id of the tracker of a discovered client."""
+    return f"{config_entry.entry_id}-client-{mac}"
+
+
+@callback
+def _async_client_entities(
+    registry: er.EntityRegistry, config_entry: ConfigEntry
+) -> dict[str, str]:
+    """Returns the registered trackers of the discovered clients by MAC."""
+
+    prefix = _client_unique_id(config_entry, "")
+    return {
+        entry.unique_id.removeprefix(prefix): entry.entity_id
+        for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id)
+        if entry.domain == Platform.DEVICE_TRACKER and entry.unique_id.startswith(prefix)
+    }
+
+
+@callback
+def _async_setup_discovery(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: CudyRouterDataUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    tracked_ids: set[str],
+) -> None:
+    """Adds and removes the trackers of the discovered clients as they come and go."""
+
+    discovery = coordinator.discovery
+    registry = er.async_get(hass)
+    registered = _async_client_entities(registry, config_entry)
+    # Clients tracked since they were discovered have their own tracker
+    for mac in registered.keys() & tracked_ids:
+        registry.async_remove(registered.pop(mac))
+    # Clients discovered before the restart stay until their eviction timeout
+    discovery.restore(registered, time.time())
+    trackers: dict[str, CudyRouterClientTracker] = {}
+
+    @callback
+    def _async_sync_clients() -> None:
+        clients = discovery.clients
+        added = [
+            CudyRouterClientTracker(coordinator, mac)
+            for mac in clients.keys() - trackers.keys()
+        ]
+        for tracker in added:
+            trackers[tracker.mac] = tracker
+        if added:
+            async_add_entities(added)
+        for mac in trackers.keys() - clients.keys():
+            # Evicted clients (or tracked ones, by hostname) are removed from
+            # the registry too, to keep it bounded
+            tracker = trackers.pop(mac)
+            if entity_id := registry.async_get_entity_id(
+                Platform.DEVICE_TRACKER, DOMAIN, _client_unique_id(config_entry, mac)
+            ):
+                registry.async_remove(entity_id)
+            elif tracker.hass is not None:
+                hass.async_create_task(tracker.async_remove())
+
+    _async_sync_clients()
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_sync_clients))
+
+class CudyRouterDeviceTracker(CudyRouterEntity, TrackerEntity):
     """Device tracker for a device connected to the Cudy Router."""
 
     def __init__(self, coordinator: CudyRouterDataUpdateCoordinator, friendly_name: str, device_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, (PRESENCE_CONTEXT, device_id))
         self._friendly_name = friendly_name
         self._device_id = device_id
         safe_name = friendly_name.replace(':', '').replace('-', '_').replace(' ', '_').lower()
@@ -61,46 +141,18 @@ class CudyRouterDeviceTracker(CoordinatorEntity, TrackerEntity):
         self._attr_should_poll = False  # Explicitly tell HA not to poll
         self._attr_available = True     # Mark entity as available by default
 
-    @property
-    def is_connected(self) -> bool:
-        """Return true if the device is connected (uses same logic as binary sensor)."""
-        if not self.coordinator.data:
-            return False
-
-        devices_module = self.coordinator.data.get(MODULE_DEVICES, {})
-        detailed = devices_module.get(SECTION_DETAILED, {})
-        device = detailed.get(self._device_id)
-
-        if not device:
-            return False
-
-        # Get configuration options
-        config_entry = self.coordinator.config_entry
-        timeout = int(config_entry.options.get(OPTIONS_PRESENCE_TIMEOUT, 180))
-        signal_check = config_entry.options.get(OPTIONS_PRESENCE_SIGNAL_CHECK, True)
-        if isinstance(signal_check, str):
-            signal_check = signal_check.lower() == "true"
-
-        # Check last seen timestamp
-        last_seen = device.get("last_seen")
-        now_ts = datetime.now().timestamp()
-
-        if last_seen and (now_ts - last_seen) <= timeout:
-            connection = (device.get("connection") or "").lower()
-            signal = device.get("signal")
+    def _data_changed(self) -> bool:
+        """True if the presence or the attributes of the device have changed.
 
-            # Wired connections are always considered connected
-            if "wired" in connection:
-                return True
+        The last_seen attribute is refreshed with the others, it is exact
+        when the device leaves.
+        """
+        return super()._data_changed() or self.coordinator.device_changed(self._device_id)
 
-            # Wireless connections: check signal if enabled
-            if signal_check:
-                return signal and str(signal).strip() not in ("", "---")
-            else:
-                # If signal check disabled, any device within timeout is connected
-                return True
-
-        return False
+    @property
+    def is_connected(self) -> bool:
+        """Return true if the device is connected (same presence as the binary sensor)."""
+        return self.coordinator.device_presence(self._device_id).home
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -113,9 +165,71 @@ class CudyRouterDeviceTracker(CoordinatorEntity, TrackerEntity):
         device = detailed.get(self._device_id)
 
         if device:
-            return device.copy()
+            return device.details()
         return {}
 
     async def async_update(self) -> None:
         """Force update of the entity state."""
         self.async_write_ha_state()
+
+
+class CudyRouterClientTracker(CudyRouterEntity, ScannerEntity):
+    """Tracker of a client discovered in the device list.
+
+    Lighter than the trackers of the configured devices: it is written only
+    when the client arrives, leaves or changes address or name.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: CudyRouterDataUpdateCoordinator, mac: str) -> None:
+        """Initialize the tracker."""
+        super().__init__(coordinator, (DISCOVERY_CONTEXT, mac))
+        self.mac = mac
+        self._attr_unique_id = _client_unique_id(coordinator.config_entry, mac)
+        client = self._client
+        hostname = client.record.hostname if client and client.record else None
+        self._attr_name = f"Cudy client {hostname or mac}"
+
+    @property
+    def _client(self) -> DiscoveredClient | None:
+        """Return the client, None once it has been evicted."""
+        return self.coordinator.discovery.clients.get(self.mac)
+
+    @property
+    def unique_id(self) -> str | None:
+        """Return the unique id, per router as several may see the same client."""
+        return self._attr_unique_id
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Return True, discovered clients were asked for."""
+        return True
+
+    @property
+    def source_type(self) -> SourceType:
+        """Return the source type."""
+        return SourceType.ROUTER
+
+    @property
+    def is_connected(self) -> bool:
+        """Return true if the client was seen within the presence timeout."""
+        client = self._client
+        return client is not None and client.home
+
+    @property
+    def mac_address(self) -> str:
+        """Return the MAC address of the client."""
+        return self.mac
+
+    @property
+    def ip_address(self) -> str | None:
+        """Return the IP address of the client."""
+        client = self._client
+        return client.record.ip if client and client.record else None
+
+    @property
+    def hostname(self) -> str | None:
+        """Return the hostname of the client."""
+        client = self._client
+        return client.record.hostname if client and client.record else None
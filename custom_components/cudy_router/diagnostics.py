@@ -0,0 +1,126 @@
+"""Diagnostics support for the Cudy Router integration."""
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .capture import REDACTED, Anonymizer, CapturedResponse
+from .const import DOMAIN, OPTIONS_DEVICELIST, OPTIONS_PARSER_ENGINE, parse_device_entry
+from .coordinator import CudyRouterDataUpdateCoordinator
+from .metrics import ENDPOINT_DEVICES, ENDPOINT_MODEM
+from .parser import get_all_devices, parse_modem_info
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, OPTIONS_DEVICELIST}
+
+
+def _parse_response(response: CapturedResponse, engine: str | None) -> Any:
+    """Parses a captured response like a poll would, runs in the executor."""
+
+    if response.status != 200:
+        return None
+    try:
+        if response.endpoint == ENDPOINT_DEVICES:
+            return [device.details() for device in get_all_devices(response.body, engine)]
+        if response.endpoint == ENDPOINT_MODEM:
+            return parse_modem_info(response.body, engine)
+    except Exception as err:  # pylint: disable=broad-except
+        return f"{type(err).__name__}: {err}"
+    return None
+
+
+def _captured_responses(
+    responses: list[CapturedResponse], anonymizer: Anonymizer, engine: str | None
+) -> list[dict[str, Any]]:
+    """Anonymizes the captured responses and parses them, runs in the executor.
+
+    The responses are parsed once anonymized, so the parsed devices show
+    the same placeholders as the pages.
+    """
+
+    result = []
+    for response in responses:
+        response = dataclasses.replace(response, body=anonymizer.anonymize(response.body))
+        result.append({**response.as_dict(), "parsed": _parse_response(response, engine)})
+    return result
+
+
+def _tracking_config(
+    coordinator: CudyRouterDataUpdateCoordinator, anonymizer: Anonymizer
+) -> dict[str, Any]:
+    """Returns the tracking configuration as used by the coordinator, anonymized."""
+
+    device_list = coordinator.config_entry.options.get(OPTIONS_DEVICELIST) or ""
+    tracked = [
+        parse_device_entry(entry)
+        for entry in device_list.replace("\n", ",").split(",")
+        if entry.strip()
+    ]
+    return {
+        "tracked_devices": [
+            {
+                "name": REDACTED if name else None,
+                "device_id": anonymizer.device_id(device_id) if device_id else None,
+            }
+            for name, device_id in tracked
+        ],
+        "presence_timeout": coordinator.presence_engine.timeout,
+        "presence_signal_check": coordinator.presence_engine.signal_check,
+        "module_intervals": coordinator.module_intervals,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    coordinator: CudyRouterDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+    metrics = api.metrics
+    # Shared by the tracked devices and the captured responses, a device
+    # gets the same placeholders in both
+    anonymizer = Anonymizer()
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "tracking": _tracking_config(coordinator, anonymizer),
+        "auth": {
+            **api.auth_stats,
+            "session_lifetime": api.session_lifetime,
+            "has_session": api.auth_cookie is not None,
+        },
+        "breaker": {
+            "state": api.breaker.state,
+            "failures": api.breaker.failures,
+            "trips": api.breaker.trips,
+        },
+        "request_budget": {
+            "tokens": round(api.request_budget.tokens, 1),
+            "throttled": api.request_budget.throttled,
+        },
+        "phase": round(coordinator.phase, 1),
+        "missing_pages": sorted(api.missing_pages),
+        "metrics": {
+            name: {**(stats.summary() or {}), "histogram": stats.histogram()}
+            for name, stats in metrics.stats.items()
+        },
+        "counters": metrics.counters,
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+    }
+
+    capture = api.capture
+    if capture is None:
+        diagnostics["captured_responses"] = None
+        return diagnostics
+
+    engine = entry.options.get(OPTIONS_PARSER_ENGINE)
+    diagnostics["captured_responses"] = await hass.async_add_executor_job(
+        _captured_responses, capture.responses(), anonymizer, engine
+    )
+    diagnostics["capture"] = {"size": capture.size, "dropped": capture.dropped}
+    return diagnostics
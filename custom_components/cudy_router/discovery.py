@@ -0,0 +1,106 @@
+"""Clients of a Cudy router discovered from its device list."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from .models import DeviceRecord
+
+# Context of the discovered clients in the coordinator changes
+DISCOVERY_CONTEXT = "discovery"
+
+
+class DiscoveredClient:
+    """A client seen in the device list without being tracked explicitly."""
+
+    __slots__ = ("record", "last_seen", "home")
+
+    def __init__(self, last_seen: float) -> None:
+        """Initialize."""
+        # Last listing of the client, None if restored and not seen yet
+        self.record: DeviceRecord | None = None
+        self.last_seen = last_seen
+        self.home = False
+
+
+class ClientDiscovery:
+    """Clients seen in the device list, least recently seen first.
+
+    Clients not seen for the eviction timeout are forgotten. Once the
+    maximum number of clients is reached, a new client replaces the least
+    recently seen one, unless every client has been seen in the same poll
+    (new clients are then left out until some leave).
+    """
+
+    def __init__(self, eviction_timeout: float, max_clients: int, presence_timeout: float) -> None:
+        """Initialize."""
+        self.eviction_timeout = eviction_timeout
+        self.max_clients = max_clients
+        self.presence_timeout = presence_timeout
+        self.clients: OrderedDict[str, DiscoveredClient] = OrderedDict()
+        # Clients left out because the maximum was reached
+        self.skipped = 0
+
+    def restore(self, macs: Iterable[str], now: float) -> None:
+        """Adds the clients known before a restart, as the least recently seen ones.
+
+        They get a full eviction timeout to be seen again.
+        """
+
+        for mac in macs:
+            if mac not in self.clients and len(self.clients) < self.max_clients:
+                self.clients[mac] = DiscoveredClient(now)
+                self.clients.move_to_end(mac, last=False)
+
+    def update(
+        self, devices: Iterable[DeviceRecord], excluded: set[str], now: float
+    ) -> set[str]:
+        """Records the clients listed in a poll, returns the ones that changed.
+
+        Clients change when they arrive or leave, or when their address or
+        name change. The excluded clients are the tracked ones, they are
+        forgotten if they were discovered before being tracked.
+        """
+
+        changed: set[str] = set()
+        clients = self.clients
+        for device in devices:
+            mac = device.mac
+            if not mac:
+                continue
+            if mac in excluded:
+                clients.pop(mac, None)
+                continue
+            client = clients.get(mac)
+            if client is None:
+                if len(clients) >= self.max_clients:
+                    oldest = next(iter(clients.values()))
+                    if oldest.last_seen >= now:
+                        self.skipped += 1
+                        continue
+                    clients.popitem(last=False)
+                client = clients[mac] = DiscoveredClient(now)
+            else:
+                clients.move_to_end(mac)
+            previous = client.record
+            if (
+                previous is None
+                or not client.home
+                or previous.ip != device.ip
+                or previous.hostname != device.hostname
+            ):
+                changed.add(mac)
+            client.record = device
+            client.last_seen = now
+            client.home = True
+
+        while clients:
+            oldest = next(iter(clients.values()))
+            if now - oldest.last_seen <= self.eviction_timeout:
+                break
+            clients.popitem(last=False)
+        for mac, client in clients.items():
+            if client.home and now - client.last_seen > self.presence_timeout:
+                client.home = False
+                changed.add(mac)
+        return changed
@@ -0,0 +1,67 @@
+"""Base entity of the Cudy Router integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import CudyRouterDataUpdateCoordinator
+
+# Entities added at once by async_add_entities_batched
+ADD_ENTITIES_BATCH = 50
+
+
+class CudyRouterEntity(CoordinatorEntity[CudyRouterDataUpdateCoordinator]):
+    """Entity updated by the coordinator only when its data has changed.
+
+    The context is the key of the entity's data in the coordinator changes
+    (see CudyRouterDataUpdateCoordinator.changed). Entities without one are
+    written on every update.
+    """
+
+    def __init__(
+        self, coordinator: CudyRouterDataUpdateCoordinator, context: Any = None
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator, context)
+        # Availability of the coordinator when the state was last written
+        self._written_available: bool | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Writes the state if the entity's data or availability has changed."""
+
+        available = self.coordinator.last_update_success
+        if available == self._written_available and not self._data_changed():
+            return
+        self._written_available = available
+        super()._handle_coordinator_update()
+
+    def _data_changed(self) -> bool:
+        """True if the entity's data changed in the last update."""
+        return self.coordinator.has_changed(self.coordinator_context)
+
+
+async def async_add_entities_batched(
+    async_add_entities: AddEntitiesCallback, entities: Iterable[Entity]
+) -> None:
+    """Adds many entities (e.g. those of the tracked devices) in batches.
+
+    The entities are created as they are added, and the event loop runs
+    between the batches instead of being held by one long addition.
+    """
+
+    batch: list[Entity] = []
+    for entity in entities:
+        batch.append(entity)
+        if len(batch) == ADD_ENTITIES_BATCH:
+            async_add_entities(batch)
+            batch = []
+            await asyncio.sleep(0)
+    if batch:
+        async_add_entities(batch)
@@ -0,0 +1,122 @@
+"""Timings and counters of the polls of a Cudy router."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import math
+import time
+from typing import Any
+
+# Samples kept for the rolling statistics of each measurement
+METRICS_WINDOW = 100
+
+# Pages whose requests are measured
+ENDPOINT_DEVICES = "devices"
+ENDPOINT_MODEM = "modem"
+
+
+def http_metric(endpoint: str) -> str:
+    """Time waiting for the responses of an endpoint, in milliseconds."""
+    return f"{endpoint}_http"
+
+
+def size_metric(endpoint: str) -> str:
+    """Size of the responses of an endpoint, in bytes."""
+    return f"{endpoint}_size"
+
+
+# Measurements, in milliseconds unless stated otherwise
+METRIC_POLL = "poll"
+METRIC_LOGIN = "login"
+METRIC_DEVICES_HTTP = http_metric(ENDPOINT_DEVICES)
+METRIC_DEVICES_PARSE = "devices_parse"
+METRIC_DEVICES_SIZE = size_metric(ENDPOINT_DEVICES)
+METRIC_MODEM_HTTP = http_metric(ENDPOINT_MODEM)
+METRIC_MODEM_PARSE = "modem_parse"
+METRIC_MODEM_SIZE = size_metric(ENDPOINT_MODEM)
+# Time spent notifying the entities of an update
+METRIC_ENTITY_UPDATE = "entity_update"
+
+# Counters
+COUNTER_RETRIES = "retries"
+COUNTER_REAUTHS = "reauths"
+
+
+def percentile(ordered: list[float], percent: float) -> float:
+    """Returns the percentile of sorted values (nearest rank)."""
+
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(0, rank - 1)]
+
+
+class RollingStats:
+    """The most recent samples of a measurement."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        """Adds a sample, dropping the oldest one when the window is full."""
+        self._samples.append(value)
+
+    def summary(self) -> dict[str, Any] | None:
+        """Returns p50, p95, max and the last value of the samples."""
+
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return {
+            "p50": round(percentile(ordered, 50), 1),
+            "p95": round(percentile(ordered, 95), 1),
+            "max": round(ordered[-1], 1),
+            "last": round(self._samples[-1], 1),
+            "samples": len(ordered),
+        }
+
+    def histogram(self) -> dict[str, int]:
+        """Counts the samples per power of two bucket (e.g. "<=64")."""
+
+        counts: dict[str, int] = {}
+        for value in sorted(self._samples):
+            bound = 1 << math.ceil(math.log2(value)) if value > 1 else 1
+            counts[f"<={bound}"] = counts.get(f"<={bound}", 0) + 1
+        return counts
+
+
+class RouterMetrics:
+    """Timings, sizes and counters recorded while polling a router."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.stats: dict[str, RollingStats] = {}
+        self.counters: dict[str, int] = {}
+
+    def record(self, name: str, value: float) -> None:
+        """Records a sample of a measurement."""
+
+        if (stats := self.stats.get(name)) is None:
+            stats = self.stats[name] = RollingStats()
+        stats.add(value)
+
+    def increment(self, name: str, count: int = 1) -> None:
+        """Increments a counter."""
+
+        self.counters[name] = self.counters.get(name, 0) + count
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Records the time spent in the block, in milliseconds."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def summary(self, name: str) -> dict[str, Any] | None:
+        """Returns the rolling statistics of a measurement, None without samples."""
+
+        stats = self.stats.get(name)
+        return stats.summary() if stats else None
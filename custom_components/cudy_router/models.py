@@ -0,0 +1,232 @@
+"""Data records of the Cudy Router integration."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+import copy
+from enum import StrEnum
+import sys
+from typing import Any
+
+from .const import COMPACT_DEVICES_LIMIT, DEVICES_ATTRIBUTE_COMPACT, DEVICES_ATTRIBUTE_NONE
+
+# Keys of the devices in the connected devices attributes
+DEVICE_ATTRIBUTE_KEYS = (
+    "hostname",
+    "ip",
+    "mac",
+    "upload_speed",
+    "download_speed",
+    "signal",
+    "online_time",
+    "online_seconds",
+    "online_display",
+    "connection",
+)
+
+
+class ConnectionType(StrEnum):
+    """How a client is connected to the router."""
+
+    WIRED = "wired"
+    WIFI_2G = "2.4g"
+    WIFI_5G = "5g"
+    WIFI = "wifi"
+    UNKNOWN = "unknown"
+
+    @classmethod
+    def from_label(cls, label: str | None) -> ConnectionType:
+        """Gets the connection type from the label shown by the router."""
+
+        label = (label or "").lower()
+        if "wired" in label:
+            return cls.WIRED
+        if "2.4g" in label:
+            return cls.WIFI_2G
+        if "5g" in label:
+            return cls.WIFI_5G
+        if "wifi" in label:
+            return cls.WIFI
+        return cls.UNKNOWN
+
+    @property
+    def is_wireless(self) -> bool:
+        """True for the WiFi connections."""
+        return self in (ConnectionType.WIFI_2G, ConnectionType.WIFI_5G, ConnectionType.WIFI)
+
+
+def _intern(value: str | None) -> str | None:
+    """Interns the strings repeated in every poll (MACs, hostnames, etc.)"""
+
+    return sys.intern(value) if value else value
+
+
+class DeviceRecord:
+    """A client device as listed by the router.
+
+    A plain class with slots rather than a dataclass: orjson serializes
+    dataclasses field by field, while the state attributes must be written
+    with the names given by as_dict.
+    """
+
+    __slots__ = (
+        "hostname",
+        "ip",
+        "mac",
+        "up_speed",
+        "down_speed",
+        "signal",
+        "online",
+        "online_seconds",
+        "online_display",
+        "connection",
+        "connection_type",
+        "last_seen",
+    )
+
+    def __init__(
+        self,
+        hostname: str | None,
+        ip: str | None,
+        mac: str | None,
+        up_speed: float | None,
+        down_speed: float | None,
+        signal: str | None,
+        online: str | None,
+        connection: str | None,
+        connection_type: ConnectionType = ConnectionType.UNKNOWN,
+        last_seen: float | None = None,
+        online_seconds: int | None = None,
+        online_display: str | None = None,
+    ) -> None:
+        """Initialize."""
+        self.hostname = hostname
+        self.ip = ip
+        self.mac = mac
+        self.up_speed = up_speed
+        self.down_speed = down_speed
+        self.signal = signal
+        self.online = online
+        # Online time in seconds and as shown in dashboards (e.g. "2d 3h 4m")
+        self.online_seconds = online_seconds
+        self.online_display = online_display
+        self.connection = connection
+        self.connection_type = connection_type
+        self.last_seen = last_seen
+
+    def __repr__(self) -> str:
+        return f"DeviceRecord(mac={self.mac!r}, ip={self.ip!r}, hostname={self.hostname!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DeviceRecord):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    __hash__ = None
+
+    @classmethod
+    def create(
+        cls,
+        hostname: str | None,
+        ip: str | None,
+        mac: str | None,
+        up_speed: float | None,
+        down_speed: float | None,
+        signal: str | None,
+        online: str | None,
+        connection: str | None,
+        online_seconds: int | None = None,
+        online_display: str | None = None,
+    ) -> DeviceRecord:
+        """Creates a record from the values parsed from the device list."""
+
+        return cls(
+            hostname=_intern(hostname),
+            ip=ip,
+            mac=_intern(mac),
+            up_speed=up_speed,
+            down_speed=down_speed,
+            signal=signal,
+            online=online,
+            connection=_intern(connection),
+            connection_type=ConnectionType.from_label(connection),
+            online_seconds=online_seconds,
+            online_display=online_display,
+        )
+
+    # Names used by the connected devices attributes (e.g. in templates)
+    @property
+    def upload_speed(self) -> float | None:
+        """Alias of up_speed."""
+        return self.up_speed
+
+    @property
+    def download_speed(self) -> float | None:
+        """Alias of down_speed."""
+        return self.down_speed
+
+    @property
+    def online_time(self) -> str | None:
+        """Alias of online."""
+        return self.online
+
+    def seen_at(self, last_seen: float) -> DeviceRecord:
+        """Returns a copy of the record with the given last_seen timestamp."""
+
+        record = copy.copy(self)
+        record.last_seen = last_seen
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        """Allows reading the record like the dicts it replaces."""
+
+        try:
+            return getattr(self, key)
+        except AttributeError as err:
+            raise KeyError(key) from err
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the device as listed in the connected devices attributes.
+
+        It is only called when the attributes are serialized.
+        """
+
+        return {key: self[key] for key in DEVICE_ATTRIBUTE_KEYS}
+
+    def details(self) -> dict[str, Any]:
+        """Returns every field of the device."""
+
+        return {
+            "hostname": self.hostname,
+            "ip": self.ip,
+            "mac": self.mac,
+            "up_speed": self.up_speed,
+            "down_speed": self.down_speed,
+            "signal": self.signal,
+            "online": self.online,
+            "online_seconds": self.online_seconds,
+            "connection": self.connection,
+            "last_seen": self.last_seen,
+        }
+
+
+def devices_attributes(
+    devices: Sequence[DeviceRecord], attribute_format: str | None
+) -> dict[str, Any]:
+    """Returns the devices attribute of the connected devices in the given format.
+
+    The full format lists every device (see DeviceRecord.as_dict). The
+    compact one has a list per key, limited to the most recently connected
+    devices. The complete list is always available from the
+    get_connected_devices service.
+    """
+
+    if attribute_format == DEVICES_ATTRIBUTE_NONE:
+        return {}
+    if attribute_format == DEVICES_ATTRIBUTE_COMPACT:
+        shown = devices[:COMPACT_DEVICES_LIMIT]
+        return {
+            "devices": {key: [device[key] for device in shown] for key in DEVICE_ATTRIBUTE_KEYS}
+        }
+    return {"devices": devices}
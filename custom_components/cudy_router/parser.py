@@ -1,14 +1,59 @@
 """Helper methods to parse HTML returned by Cudy routers"""
 
+import codecs
+from collections.abc import Callable
+from functools import lru_cache
+import hashlib
+import html
+from html.parser import HTMLParser
+import logging
 import re
-from typing import Any
-from bs4 import BeautifulSoup
-from dateutil.relativedelta import relativedelta
+import time
+from typing import Any, Protocol
 from datetime import datetime
 
 from homeassistant.const import STATE_UNAVAILABLE
 
-from .const import SECTION_DETAILED, parse_device_entry
+from .const import (
+    PARSER_ENGINE_AUTO,
+    PARSER_ENGINE_HTML_PARSER,
+    PARSER_ENGINE_LXML,
+    PARSER_ENGINE_SELECTOLAX,
+    SECTION_DETAILED,
+    parse_device_entry,
+)
+from .models import DeviceRecord
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Durations shown by the firmware, e.g. "03:04:05", "2 Day 03:04:05" or
+# "1 Year 2 Months 3 Weeks 4 Days 05:06:07"
+DURATION_UNIT_PATTERN = re.compile(r"(\d+)\s*(year|month|week|day|hour|min|sec)", re.IGNORECASE)
+DURATION_CLOCK_PATTERN = re.compile(r"(\d+):(\d+)(?::(\d+))?")
+DURATION_UNIT_SECONDS = {
+    "year": 365 * 86400,
+    "month": 30 * 86400,
+    "week": 7 * 86400,
+    "day": 86400,
+    "hour": 3600,
+    "min": 60,
+    "sec": 1,
+}
+
+INPUT_TAG_PATTERN = re.compile(r"<input\b[^>]*>", re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(
+    r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+)
 
 
 def add_unique(data: dict[str, Any], key: str, value: Any):
@@ -22,26 +67,32 @@ def add_unique(data: dict[str, Any], key: str, value: Any):
     data[unique_key] = value
 
 
-def parse_tables(input_html: str) -> dict[str, Any]:
+def parse_tables(input_html: str, engine: str | None = None) -> dict[str, Any]:
     """Parses an HTML table extracting key-value pairs"""
 
-    data: dict[str, str] = {}
-    soup = BeautifulSoup(input_html, "html.parser")
-    tables = soup.find_all("table")
-    for table in tables:
-        for row in table.find_all("tr"):
-            cols = row.css.select("td p.visible-xs")
-            row_data: list[str] = []
-            for col in cols:
-                stripped_text = col.text.strip()
-                if stripped_text:
-                    row_data.append(stripped_text)
-            if len(row_data) > 1:
-                add_unique(data, row_data[0], re.sub("[\n]", "", row_data[1]))
-            elif len(row_data) == 1:
-                add_unique(data, row_data[0], "")
+    target = _TableRows()
+    parse_html(input_html, target, engine)
+    return target.values
 
-    return data
+
+def parse_input_values(input_html: str) -> dict[str, str]:
+    """Extracts the name/value pairs of the input fields (e.g. of the login form)
+
+    Only the input tags are scanned, no HTML tree is built.
+    """
+
+    values: dict[str, str] = {}
+    for tag in INPUT_TAG_PATTERN.findall(input_html):
+        attributes: dict[str, str] = {}
+        for match in ATTRIBUTE_PATTERN.finditer(tag):
+            name, *value = match.groups()
+            attributes[name.lower()] = html.unescape(
+                next((v for v in value if v is not None), "")
+            )
+        name = attributes.get("name")
+        if name and name not in values:
+            values[name] = attributes.get("value", "")
+    return values
 
 
 def parse_speed(input_string: str) -> float:
@@ -60,70 +111,546 @@ def parse_speed(input_string: str) -> float:
     return 0
 
 
-def get_all_devices(input_html: str) -> dict[str, Any]:
-    """Parses an HTML table extracting key-value pairs, including signal and online time if present."""
-    devices = []
-    soup = BeautifulSoup(input_html, "html.parser")
-    for br_element in soup.find_all("br"):
-        br_element.replace_with("\n" + br_element.text)
-    tables = soup.find_all("table")
-    for table in tables:
-        for row in table.find_all("tr"):
-            ip, mac, up_speed, down_speed, hostname, signal, online, connection = [None, None, None, None, None, None, None, None]
-            cols = row.css.select("td div")
-            for col in cols:
-                div_id = col.attrs.get("id")
-                content_element = col.css.select_one("p.visible-xs")
-                # Extract connection type from hostname cell
-                if div_id and div_id.endswith("hostname"):
-                    span = col.css.select_one("span.text-primary")
-                    if span:
-                        connection = span.text.strip()
-                if not div_id or not content_element:
-                    continue
-                content = content_element.text.strip()
-                if "\n" in content:
-                    if div_id.endswith("ipmac"):
-                        ip, mac = [x.strip() for x in content.split("\n")]
-                    if div_id.endswith("speed"):
-                        up_speed, down_speed = [x.strip() for x in content.split("\n")]
-                    if div_id.endswith("hostname"):
-                        hostname = content.split("\n")[0].strip()
-                    if div_id.endswith("signal"):
-                        signal = content.split("\n")[0].strip()
-                    if div_id.endswith("online"):
-                        online = content.split("\n")[0].strip()
-                else:
-                    if div_id and div_id.endswith("signal"):
-                        signal = content
-                    if div_id and div_id.endswith("online"):
-                        online = content
-            if mac or ip:
-                devices.append(
-                    {
-                        "hostname": hostname,
-                        "ip": ip,
-                        "mac": mac,
-                        "up_speed": parse_speed(up_speed),
-                        "down_speed": parse_speed(down_speed),
-                        "signal": signal,
-                        "online": online,
-                        "connection": connection,
-                    }
+class ParserTarget(Protocol):
+    """Receives the events of an HTML parser engine.
+
+    Targets never see the HTML tree, only the start and end of the tags and the
+    text in between, in document order (as an lxml parser target).
+    """
+
+    done: bool
+
+    def start(self, tag: str, attrs: dict[str, str | None]) -> None:
+        """Handles an opening tag."""
+
+    def end(self, tag: str) -> None:
+        """Handles a closing tag."""
+
+    def data(self, text: str) -> None:
+        """Handles text content."""
+
+    def close(self) -> None:
+        """Handles the end of the document."""
+
+
+class ParserEngine(Protocol):
+    """Feeds an HTML document, in one or more chunks, to a target."""
+
+    def feed(self, data: str) -> None:
+        """Parses the next chunk of the document."""
+
+    def close(self) -> None:
+        """Finishes the document."""
+
+
+class _HtmlParserEngine(HTMLParser):
+    """Engine based on the HTML parser of the standard library"""
+
+    def __init__(self, target: ParserTarget) -> None:
+        """Initialize."""
+        super().__init__(convert_charrefs=True)
+        self._target = target
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._target.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._target.start(tag, dict(attrs))
+        self._target.end(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._target.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._target.data(data)
+
+    def close(self) -> None:
+        super().close()
+        self._target.close()
+
+
+class _LxmlEngine:
+    """Engine based on the (incremental) libxml2 HTML parser of lxml"""
+
+    def __init__(self, target: ParserTarget) -> None:
+        """Initialize."""
+        self._parser = etree.HTMLParser(target=target)
+
+    def feed(self, data: str) -> None:
+        self._parser.feed(data)
+
+    def close(self) -> None:
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            # Raised for an empty document, the target has nothing to process
+            pass
+
+
+class _SelectolaxEngine:
+    """Engine based on the lexbor HTML parser of selectolax
+
+    The document is parsed at once when it is closed, then its tree is walked.
+    """
+
+    def __init__(self, target: ParserTarget) -> None:
+        """Initialize."""
+        self._target = target
+        self._chunks: list[str] = []
+
+    def feed(self, data: str) -> None:
+        self._chunks.append(data)
+
+    def close(self) -> None:
+        tree = LexborHTMLParser("".join(self._chunks))
+        self._chunks = []
+        self._walk(tree.root)
+        self._target.close()
+
+    def _walk(self, node: Any) -> None:
+        target = self._target
+        while node is not None and not target.done:
+            tag = node.tag
+            if tag == "-text":
+                target.data(node.text_content)
+            elif tag[0] not in "-_!":
+                # Not a comment, doctype, etc.
+                target.start(tag, node.attributes)
+                self._walk(node.child)
+                target.end(tag)
+            node = node.next
+
+
+PARSER_ENGINES: dict[str, Callable[[ParserTarget], ParserEngine]] = {
+    PARSER_ENGINE_HTML_PARSER: _HtmlParserEngine,
+}
+if etree is not None:
+    PARSER_ENGINES[PARSER_ENGINE_LXML] = _LxmlEngine
+if LexborHTMLParser is not None:
+    PARSER_ENGINES[PARSER_ENGINE_SELECTOLAX] = _SelectolaxEngine
+
+# Fastest available engine first
+DEFAULT_PARSER_ENGINE = next(
+    engine
+    for engine in (PARSER_ENGINE_LXML, PARSER_ENGINE_SELECTOLAX, PARSER_ENGINE_HTML_PARSER)
+    if engine in PARSER_ENGINES
+)
+
+
+def create_parser_engine(target: ParserTarget, engine: str | None = None) -> ParserEngine:
+    """Creates a parser engine feeding the given target.
+
+    The engine is selected by name, the fastest available one is used by default
+    (or if the requested one is not installed).
+    """
+
+    if not engine or engine == PARSER_ENGINE_AUTO:
+        engine = DEFAULT_PARSER_ENGINE
+    elif engine not in PARSER_ENGINES:
+        _LOGGER.warning(
+            "HTML parser %s is not available, using %s", engine, DEFAULT_PARSER_ENGINE
+        )
+        engine = DEFAULT_PARSER_ENGINE
+    return PARSER_ENGINES[engine](target)
+
+
+def parse_html(input_html: str, target: ParserTarget, engine: str | None = None) -> None:
+    """Feeds a complete HTML document to the target."""
+
+    parser = create_parser_engine(target, engine)
+    parser.feed(input_html)
+    parser.close()
+
+
+class _TableRows:
+    """Collects the texts of the p.visible-xs cells of each table row"""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.values: dict[str, str] = {}
+        self.done = False
+        self._table_depth = 0
+        self._td_depth = 0
+        self._row: list[str] | None = None
+        # Text of the p.visible-xs being read and the depth of the nested p tags
+        self._cell: list[str] | None = None
+        self._p_depth = 0
+
+    def start(self, tag: str, attrs: dict[str, str | None]) -> None:
+        if tag == "table":
+            self._table_depth += 1
+        elif not self._table_depth:
+            return
+        elif tag == "tr":
+            self._finish_row()
+            self._row = []
+        elif self._row is None:
+            return
+        elif tag == "td":
+            self._td_depth += 1
+        elif tag == "p":
+            if self._p_depth:
+                self._p_depth += 1
+            elif self._td_depth and "visible-xs" in (attrs.get("class") or "").split():
+                self._cell = []
+                self._p_depth = 1
+
+    def end(self, tag: str) -> None:
+        if tag == "table":
+            self._finish_row()
+            self._table_depth = max(0, self._table_depth - 1)
+        elif self._row is None:
+            return
+        elif tag == "tr":
+            self._finish_row()
+        elif tag == "td":
+            self._td_depth = max(0, self._td_depth - 1)
+        elif tag == "p" and self._p_depth:
+            self._p_depth -= 1
+            if not self._p_depth:
+                self._finish_cell()
+
+    def data(self, text: str) -> None:
+        if self._p_depth:
+            self._cell.append(text)
+
+    def close(self) -> None:
+        self._finish_row()
+
+    def _finish_cell(self) -> None:
+        stripped_text = "".join(self._cell).strip()
+        if stripped_text:
+            self._row.append(stripped_text)
+        self._cell = None
+        self._p_depth = 0
+
+    def _finish_row(self) -> None:
+        row_data = self._row
+        if row_data is None:
+            return
+        if self._cell is not None:
+            self._finish_cell()
+        self._row = None
+        self._td_depth = 0
+        if len(row_data) > 1:
+            add_unique(self.values, row_data[0], re.sub("[\n]", "", row_data[1]))
+        elif len(row_data) == 1:
+            add_unique(self.values, row_data[0], "")
+
+
+class _SimIcon:
+    """Finds the classes of the first i.icon[class*='sim'] element"""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.classnames: list[str] | None = None
+        self.done = False
+
+    def start(self, tag: str, attrs: dict[str, str | None]) -> None:
+        if self.done or tag != "i":
+            return
+        classes = attrs.get("class") or ""
+        if "sim" in classes and "icon" in classes.split():
+            self.classnames = classes.split()
+            self.done = True
+
+    def end(self, tag: str) -> None:
+        pass
+
+    def data(self, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class _DeviceCell:
+    """Text collected from a div of a device table cell"""
+
+    __slots__ = ("div_id", "content", "p_depth", "connection", "span_depth")
+
+    def __init__(self, div_id: str | None) -> None:
+        """Initialize."""
+        self.div_id = div_id
+        # Text of the first p.visible-xs and of the first span.text-primary
+        self.content: list[str] | None = None
+        self.p_depth = 0
+        self.connection: list[str] | None = None
+        self.span_depth = 0
+
+    def start(self, tag: str, classes: list[str]) -> None:
+        if tag == "p":
+            if self.p_depth:
+                self.p_depth += 1
+            elif self.content is None and "visible-xs" in classes:
+                self.content = []
+                self.p_depth = 1
+        elif tag == "span":
+            if self.span_depth:
+                self.span_depth += 1
+            elif self.connection is None and "text-primary" in classes:
+                self.connection = []
+                self.span_depth = 1
+        elif tag == "br":
+            self.data("\n")
+
+    def end(self, tag: str) -> None:
+        if tag == "p" and self.p_depth:
+            self.p_depth -= 1
+        elif tag == "span" and self.span_depth:
+            self.span_depth -= 1
+
+    def data(self, text: str) -> None:
+        if self.p_depth:
+            self.content.append(text)
+        if self.span_depth:
+            self.connection.append(text)
+
+
+class _DeviceRows:
+    """Collects devices from the rows of the device table, one row at a time."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.devices: list[DeviceRecord] = []
+        # Set once the table with the devices has been closed
+        self.done = False
+        self._table_depth = 0
+        self._td_depth = 0
+        self._row: dict[str, Any] | None = None
+        # Open divs of the current row, None for the ones not inside a cell
+        self._divs: list[_DeviceCell | None] = []
+
+    def start(self, tag: str, attrs: dict[str, str | None]) -> None:
+        if self.done:
+            return
+        if tag == "table":
+            self._table_depth += 1
+        elif not self._table_depth:
+            return
+        elif tag == "tr":
+            self._finish_row()
+            self._row = dict.fromkeys(
+                ("ip", "mac", "up_speed", "down_speed", "hostname", "signal", "online", "connection")
+            )
+        elif self._row is None:
+            return
+        elif tag == "td":
+            self._td_depth += 1
+        elif tag == "div":
+            self._divs.append(_DeviceCell(attrs.get("id")) if self._td_depth else None)
+        else:
+            classes = (attrs.get("class") or "").split()
+            for div in self._divs:
+                if div:
+                    div.start(tag, classes)
+
+    def end(self, tag: str) -> None:
+        if self.done:
+            return
+        if tag == "table":
+            self._finish_row()
+            self._table_depth = max(0, self._table_depth - 1)
+            if not self._table_depth and self.devices:
+                self.done = True
+        elif self._row is None:
+            return
+        elif tag == "tr":
+            self._finish_row()
+        elif tag == "td":
+            self._td_depth = max(0, self._td_depth - 1)
+        elif tag == "div":
+            if self._divs and (div := self._divs.pop()):
+                self._add_cell(div)
+        else:
+            for div in self._divs:
+                if div:
+                    div.end(tag)
+
+    def data(self, text: str) -> None:
+        if self._row is not None:
+            for div in self._divs:
+                if div:
+                    div.data(text)
+
+    def close(self) -> None:
+        self._finish_row()
+
+    def _add_cell(self, div: _DeviceCell) -> None:
+        row = self._row
+        div_id = div.div_id
+        # Extract connection type from hostname cell
+        if div_id and div_id.endswith("hostname") and div.connection is not None:
+            row["connection"] = "".join(div.connection).strip()
+        if not div_id or div.content is None:
+            return
+        content = "".join(div.content).strip()
+        if "\n" in content:
+            lines = [x.strip() for x in content.split("\n")]
+            values = [x for x in lines if x]
+            if div_id.endswith("ipmac") and len(values) > 1:
+                row["ip"], row["mac"] = values[:2]
+            if div_id.endswith("speed") and len(values) > 1:
+                row["up_speed"], row["down_speed"] = values[:2]
+            if div_id.endswith("hostname"):
+                row["hostname"] = lines[0]
+            if div_id.endswith("signal"):
+                row["signal"] = lines[0]
+            if div_id.endswith("online"):
+                row["online"] = lines[0]
+        else:
+            if div_id.endswith("signal"):
+                row["signal"] = content
+            if div_id.endswith("online"):
+                row["online"] = content
+
+    def _finish_row(self) -> None:
+        row = self._row
+        if row is None:
+            return
+        while self._divs:
+            if div := self._divs.pop():
+                self._add_cell(div)
+        self._row = None
+        self._td_depth = 0
+        if row["mac"] or row["ip"]:
+            online_seconds = get_seconds_duration(row["online"])
+            self.devices.append(
+                DeviceRecord.create(
+                    hostname=row["hostname"],
+                    ip=row["ip"],
+                    mac=row["mac"],
+                    up_speed=parse_speed(row["up_speed"]),
+                    down_speed=parse_speed(row["down_speed"]),
+                    signal=row["signal"],
+                    online=row["online"],
+                    connection=row["connection"],
+                    online_seconds=online_seconds,
+                    online_display=format_duration(online_seconds),
                 )
+            )
 
-    return devices
 
+class DeviceListParser:
+    """Incremental parser of the device list page.
+
+    The page can be fed in chunks as it arrives from the network. Devices are
+    collected row by row without building an HTML tree, so only the row being
+    parsed is kept besides the result. Once the device table is closed the
+    rest of the page is ignored (see done).
+    """
+
+    def __init__(self, encoding: str = "utf-8", engine: str | None = None) -> None:
+        """Initialize."""
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._hash = hashlib.blake2b(digest_size=16)
+        self._rows = _DeviceRows()
+        self._engine = create_parser_engine(self._rows, engine)
+        # Seconds spent parsing, excluding the time waiting for the chunks
+        self.parse_time = 0.0
+
+    @property
+    def devices(self) -> list[DeviceRecord]:
+        """The devices parsed so far"""
+        return self._rows.devices
+
+    @property
+    def done(self) -> bool:
+        """True if the device table has been parsed and the rest can be skipped"""
+        return self._rows.done
+
+    @property
+    def digest(self) -> bytes:
+        """Digest of the content fed until the device table was closed"""
+        return self._hash.digest()
+
+    def feed(self, chunk: bytes | str) -> None:
+        """Parses the next chunk of the page."""
+
+        if self.done:
+            return
+        start = time.perf_counter()
+        if isinstance(chunk, str):
+            self._hash.update(chunk.encode())
+        else:
+            self._hash.update(chunk)
+            chunk = self._decoder.decode(chunk)
+        self._engine.feed(chunk)
+        self.parse_time += time.perf_counter() - start
+
+    def close(self) -> None:
+        """Finishes parsing at the end of the page."""
+
+        start = time.perf_counter()
+        if not self.done:
+            self._engine.feed(self._decoder.decode(b"", final=True))
+            self._engine.close()
+        self._rows.close()
+        self.parse_time += time.perf_counter() - start
+
+
+def get_all_devices(input_html: str, engine: str | None = None) -> list[DeviceRecord]:
+    """Parses an HTML table extracting key-value pairs, including signal and online time if present."""
 
-def get_sim_value(input_html: str) -> str:
+    parser = DeviceListParser(engine=engine)
+    parser.feed(input_html)
+    parser.close()
+    return parser.devices
+
+
+class DeviceListCache:
+    """Remembers the devices parsed from the last device list page.
+
+    Pages are identified by a digest of their raw content, so a byte-identical
+    page is served from the cache without parsing it again. Streamed pages are
+    parsed and digested as they arrive (see DeviceListParser), so the parsing
+    overlaps the download and stops at the end of the device table. An
+    unchanged streamed page is still parsed, but gives back the same records
+    as before, which the callers compare by identity.
+
+    The records are shared with the callers, which must not modify them
+    (see DeviceRecord.seen_at).
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.digest: bytes | None = None
+        self.devices: list[DeviceRecord] = []
+        self.hits = 0
+        self.misses = 0
+
+    def get_all_devices(self, input_html: str, engine: str | None = None) -> list[DeviceRecord]:
+        """Returns the devices of the page, parsing it only if it has changed."""
+
+        digest = hashlib.blake2b(input_html.encode(), digest_size=16).digest()
+        if digest == self.digest:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.devices = get_all_devices(input_html, engine)
+            self.digest = digest
+        return self.devices
+
+    def add_parsed(self, parser: DeviceListParser) -> list[DeviceRecord]:
+        """Returns the devices of a page parsed while streaming."""
+
+        if parser.digest == self.digest:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.devices = parser.devices
+            self.digest = parser.digest
+        return self.devices
+
+
+def get_sim_value(input_html: str, engine: str | None = None) -> str:
     """Gets the SIM slot value out of the displayed icon"""
 
-    soup = BeautifulSoup(input_html, "html.parser")
-    sim_icon = soup.css.select_one("i.icon[class*='sim']")
-    if sim_icon:
-        classnames = sim_icon.attrs["class"]
+    target = _SimIcon()
+    parse_html(input_html, target, engine)
+    if target.classnames:
         classname = next(
-            iter([match for match in classnames if "sim" in match]),
+            iter([match for match in target.classnames if "sim" in match]),
             "",
         )
         if "sim1" in classname:
@@ -177,88 +704,99 @@ def get_band(raw_band_info: str):
     return None
 
 
-def get_seconds_duration(raw_duration: str) -> int:
-    """Parses string duration and returns it as seconds"""
+@lru_cache(maxsize=1024)
+def get_seconds_duration(raw_duration: str | None) -> int | None:
+    """Parses string duration and returns it as seconds
+
+    Years and months are counted as 365 and 30 days. Returns None if the
+    string has no duration (e.g. "---").
+    """
 
     if not raw_duration:
         return None
-    duration_parts = raw_duration.lower().split()
-    duration = relativedelta()
-
-    for i, part in enumerate(duration_parts):
-        if part.count(":") == 2:
-            hours, minutes, seconds = part.split(":")
-            duration += relativedelta(
-                hours=as_int(hours), minutes=as_int(minutes), seconds=as_int(seconds)
-            )
-        elif i == 0:
-            continue
-        elif part.startswith("year"):
-            duration += relativedelta(years=as_int(duration_parts[i - 1]))
-        elif part.startswith("month"):
-            duration += relativedelta(months=as_int(duration_parts[i - 1]))
-        elif part.startswith("week"):
-            duration += relativedelta(weeks=as_int(duration_parts[i - 1]))
-        elif part.startswith("day"):
-            duration += relativedelta(days=as_int(duration_parts[i - 1]))
-
-    # Get absolute duration from relative duration (considering different month lengths)
-    return (datetime.now() - (datetime.now() - duration)).total_seconds()
-
-
-def parse_devices(input_html: str, device_list_str: str, previous_devices: dict[str, Any] = None) -> dict[str, Any]:
+    seconds = 0
+    found = False
+    for match in DURATION_UNIT_PATTERN.finditer(raw_duration):
+        seconds += int(match[1]) * DURATION_UNIT_SECONDS[match[2].lower()]
+        found = True
+    if match := DURATION_CLOCK_PATTERN.search(raw_duration):
+        if match[3] is None:
+            # HH:MM
+            seconds += int(match[1]) * 3600 + int(match[2]) * 60
+        else:
+            seconds += int(match[1]) * 3600 + int(match[2]) * 60 + int(match[3])
+        found = True
+    return seconds if found else None
+
+
+def format_duration(seconds: int | None) -> str | None:
+    """Formats a duration for display, e.g. 2d 3h 4m (<1m under a minute)"""
+
+    if seconds is None:
+        return None
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes = seconds // 60
+    parts = [
+        f"{value}{unit}"
+        for value, unit in ((days, "d"), (hours, "h"), (minutes, "m"))
+        if value
+    ]
+    return " ".join(parts) or "<1m"
+
+
+def parse_devices(
+    input_html: str,
+    device_list_str: str,
+    previous_devices: dict[str, Any] = None,
+    cache: DeviceListCache | None = None,
+    engine: str | None = None,
+) -> dict[str, Any]:
     """Parses devices page and tracks last_seen timestamps for each device."""
-    devices = get_all_devices(input_html)
+    devices = (
+        cache.get_all_devices(input_html, engine)
+        if cache
+        else get_all_devices(input_html, engine)
+    )
+    return summarize_devices(devices, device_list_str, previous_devices)
+
+
+def summarize_devices(
+    devices: list[DeviceRecord],
+    device_list_str: str,
+    previous_devices: dict[str, Any] = None,
+) -> dict[str, Any]:
+    """Builds the devices module data and tracks last_seen timestamps for each device.
+
+    The records may be shared with the device list cache, so they are never
+    modified: tracked devices get a copy with their last_seen timestamp.
+    """
     data = {"device_count": {"value": len(devices)}}
     
-    # Sort devices by online time (newest first = shortest time first)
-    def time_to_minutes(time_str):
-        if not time_str or time_str == "---":
-            return 999999
-        try:
-            parts = time_str.split(":")
-            if len(parts) >= 2:
-                return int(parts[0]) * 60 + int(parts[1])
-        except (ValueError, IndexError):
-            pass
-        return 999999
-    
-    devices.sort(key=lambda d: time_to_minutes(d.get("online", "---")))
-    
-    # Store all devices for the connected devices sensor
-    all_devices_formatted = []
-    for device in devices:
-        device_info = {
-            "hostname": device.get("hostname", "Unknown"),
-            "ip": device.get("ip", "Unknown"),
-            "mac": device.get("mac", "Unknown"),
-            "upload_speed": device.get("up_speed", 0),
-            "download_speed": device.get("down_speed", 0),
-            "signal": device.get("signal", "---"),
-            "online_time": device.get("online", "---"),
-            "connection": device.get("connection", "Unknown"),
-        }
-        all_devices_formatted.append(device_info)
+    # Sort devices by online time (newest first = shortest time first, unknown last)
+    devices = sorted(
+        devices, key=lambda d: (d.online_seconds is None, d.online_seconds or 0)
+    )
     
-    # Store the formatted device list for the connected devices sensor
+    # The records are turned into dicts (see DeviceRecord.as_dict) only when
+    # the attributes of the connected devices sensor are serialized
     data["connected_devices"] = {
         "value": len(devices), 
         "attributes": {
-            "devices": all_devices_formatted,
+            "devices": devices,
             "device_count": len(devices),
-            "last_updated": datetime.now().isoformat(),
         }
     }
     
     if devices:
-        top_download_device = max(devices, key=lambda item: item.get("down_speed"))
-        data["top_downloader_speed"] = {"value": top_download_device.get("down_speed")}
-        data["top_downloader_mac"] = {"value": top_download_device.get("mac")}
-        data["top_downloader_hostname"] = {"value": top_download_device.get("hostname")}
-        top_upload_device = max(devices, key=lambda item: item.get("up_speed"))
-        data["top_uploader_speed"] = {"value": top_upload_device.get("up_speed")}
-        data["top_uploader_mac"] = {"value": top_upload_device.get("mac")}
-        data["top_uploader_hostname"] = {"value": top_upload_device.get("hostname")}
+        top_download_device = max(devices, key=lambda item: item.down_speed or 0)
+        data["top_downloader_speed"] = {"value": top_download_device.down_speed}
+        data["top_downloader_mac"] = {"value": top_download_device.mac}
+        data["top_downloader_hostname"] = {"value": top_download_device.hostname}
+        top_upload_device = max(devices, key=lambda item: item.up_speed or 0)
+        data["top_uploader_speed"] = {"value": top_upload_device.up_speed}
+        data["top_uploader_mac"] = {"value": top_upload_device.mac}
+        data["top_uploader_hostname"] = {"value": top_upload_device.hostname}
 
         data[SECTION_DETAILED] = {}
         # Parse device list entries to extract MAC addresses for matching
@@ -270,33 +808,33 @@ def parse_devices(input_html: str, device_list_str: str, previous_devices: dict[
         now_ts = datetime.now().timestamp()
         previous_detailed = (previous_devices or {}).get(SECTION_DETAILED, {}) if previous_devices else {}
         for device in devices:
-            key = device.get("mac") if device.get("mac") in device_list else device.get("hostname")
+            key = device.mac if device.mac in device_list else device.hostname
             if key in device_list:
                 # If device was present before, keep its last_seen if not present now
-                prev = previous_detailed.get(key, {})
+                prev = previous_detailed.get(key)
                 # If device is present in this scan, update last_seen
-                device["last_seen"] = now_ts
+                last_seen = now_ts
                 # If previous last_seen exists and is more recent, keep it (shouldn't happen, but safe)
-                if prev.get("last_seen") and prev["last_seen"] > device["last_seen"]:
-                    device["last_seen"] = prev["last_seen"]
-                data[SECTION_DETAILED][key] = device
+                if prev and prev.last_seen and prev.last_seen > last_seen:
+                    last_seen = prev.last_seen
+                data[SECTION_DETAILED][key] = device.seen_at(last_seen)
         # For tracked devices not present in this scan, keep their last_seen from previous
         for key in device_list:
             if key not in data[SECTION_DETAILED] and key in previous_detailed:
                 data[SECTION_DETAILED][key] = previous_detailed[key]
         data["total_down_speed"] = {
-            "value": sum(device.get("down_speed") for device in devices) or 0.0
+            "value": sum(device.down_speed or 0 for device in devices) or 0.0
         }
         data["total_up_speed"] = {
-            "value": sum(device.get("up_speed") for device in devices) or 0.0
+            "value": sum(device.up_speed or 0 for device in devices) or 0.0
         }
     return data
 
 
-def parse_modem_info(input_html: str) -> dict[str, Any]:
+def parse_modem_info(input_html: str, engine: str | None = None) -> dict[str, Any]:
     """Parses modem info page"""
 
-    raw_data = parse_tables(input_html)
+    raw_data = parse_tables(input_html, engine)
     cellid = hex_as_int(raw_data.get("Cell ID"))
     pcc = raw_data.get("PCC") or (
         f"BAND {raw_data.get('Band')} / {raw_data.get('DL Bandwidth')}"
@@ -320,7 +858,7 @@ def parse_modem_info(input_html: str) -> dict[str, Any]:
         "rsrp": {"value": as_int(raw_data.get("RSRP"))},
         "rsrq": {"value": as_int(raw_data.get("RSRQ"))},
         "sinr": {"value": as_int(raw_data.get("SINR"))},
-        "sim": {"value": get_sim_value(input_html)},
+        "sim": {"value": get_sim_value(input_html, engine)},
         "band": {
             "value": "+".join(
                 filter(
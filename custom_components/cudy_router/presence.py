@@ -0,0 +1,82 @@
+"""Presence of the devices tracked by the Cudy Router integration."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from .const import OPTIONS_PRESENCE_SIGNAL_CHECK, OPTIONS_PRESENCE_TIMEOUT
+from .models import ConnectionType, DeviceRecord
+
+DEFAULT_PRESENCE_TIMEOUT = 180
+# Signal values shown by the router for devices without a wireless signal
+NO_SIGNAL = ("", "---", "None")
+# Context of the presence of a device in the coordinator changes
+PRESENCE_CONTEXT = "presence"
+
+
+class DevicePresence(NamedTuple):
+    """Presence of a tracked device."""
+
+    home: bool
+    last_seen: float | None
+
+
+NOT_FOUND = DevicePresence(False, None)
+
+
+class PresenceEngine:
+    """Evaluates the presence of every tracked device once per poll.
+
+    The options are read when the engine is created, the entry is reloaded
+    when they change.
+    """
+
+    def __init__(self, options: Mapping[str, Any] | None) -> None:
+        """Initialize."""
+        options = options or {}
+        self.timeout = int(options.get(OPTIONS_PRESENCE_TIMEOUT) or DEFAULT_PRESENCE_TIMEOUT)
+        signal_check = options.get(OPTIONS_PRESENCE_SIGNAL_CHECK, True)
+        if isinstance(signal_check, str):
+            signal_check = signal_check.lower() == "true"
+        self.signal_check = bool(signal_check)
+
+    def is_home(self, device: DeviceRecord, now_ts: float) -> bool:
+        """True if the device is connected to the router."""
+
+        last_seen = device.last_seen
+        if not last_seen or now_ts - last_seen > self.timeout:
+            return False
+        # Wired connections are always home
+        if device.connection_type is ConnectionType.WIRED:
+            return True
+        # Wireless: check signal if enabled, otherwise any device within timeout is home
+        if self.signal_check:
+            return bool(device.signal) and str(device.signal).strip() not in NO_SIGNAL
+        return True
+
+    def pending(
+        self, presence: Mapping[str, DevicePresence], seen_since: float
+    ) -> bool:
+        """True if a device still home has not been seen since the given time.
+
+        It is leaving, or the router has missed it once: the device will be
+        marked away at the end of the timeout unless it is seen again.
+        """
+
+        return any(
+            device.home and (device.last_seen or 0) < seen_since
+            for device in presence.values()
+        )
+
+    def evaluate(
+        self, devices: Mapping[str, DeviceRecord], now_ts: float | None = None
+    ) -> dict[str, DevicePresence]:
+        """Returns the presence of the given tracked devices."""
+
+        if now_ts is None:
+            now_ts = datetime.now().timestamp()
+        return {
+            device_id: DevicePresence(self.is_home(device, now_ts), device.last_seen)
+            for device_id, device in devices.items()
+        }
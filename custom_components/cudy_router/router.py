@@ -1,19 +1,48 @@
 """Provides the backend for a Cudy router"""
+import asyncio
+from collections.abc import Iterable
 import hashlib
+import random
 import time
 from datetime import timedelta
 from typing import Any
-import requests
 import logging
-import urllib.parse
 from http.cookies import SimpleCookie
 
-from bs4 import BeautifulSoup
+import aiohttp
 
-from .const import MODULE_DEVICES, MODULE_MODEM, OPTIONS_DEVICELIST
-from .parser import parse_devices, parse_modem_info
+from .const import (
+    MODULE_DEVICES,
+    MODULE_MODEM,
+    OPTIONS_DEVICELIST,
+    OPTIONS_PARSER_ENGINE,
+)
+from .capture import ResponseCapture
+from .metrics import (
+    COUNTER_REAUTHS,
+    COUNTER_RETRIES,
+    ENDPOINT_DEVICES,
+    ENDPOINT_MODEM,
+    METRIC_DEVICES_PARSE,
+    METRIC_LOGIN,
+    METRIC_MODEM_PARSE,
+    METRIC_POLL,
+    RouterMetrics,
+    http_metric,
+    size_metric,
+)
+from .parser import (
+    DeviceListCache,
+    DeviceListParser,
+    parse_input_values,
+    parse_modem_info,
+    summarize_devices,
+)
+from .scheduler import async_get_scheduler
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
 import homeassistant.util.dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,46 +51,338 @@ MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=15)
 SCAN_INTERVAL = timedelta(seconds=30)
 RETRY_INTERVAL = timedelta(seconds=300)
 
+LOGIN_TIMEOUT = aiohttp.ClientTimeout(total=10)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+# Let the router compress responses when the firmware supports it
+DEFAULT_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+STREAM_CHUNK_SIZE = 16 * 1024
+# Delay for writing the session to the disk (the cookie may be replaced again quickly)
+SESSION_SAVE_DELAY = 10
+
+# Consecutive request failures after which the router is considered unreachable
+BREAKER_FAILURE_THRESHOLD = 3
+# First pause of the requests to an unreachable router, doubled each time it fails again
+BREAKER_BASE_DELAY = 30
+BREAKER_JITTER = 0.2
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+MODEM_STATUS_PAGE = "admin/network/gcom/status"
+DEVICES_PAGE = "admin/network/devices/devlist?detail=1"
+
+
+class RouterUnavailable(ConnectionError):
+    """Error to indicate that requests to the router are paused."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        """Initialize."""
+        super().__init__(
+            f"Router {host} is unreachable, next attempt in {retry_in:.0f} seconds"
+        )
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Pauses the requests to a router that stopped responding.
+
+    After a few consecutive failures the breaker opens and requests are
+    rejected without touching the network. When the (jittered, exponentially
+    growing) delay is over, the breaker is half-open: a single probe request
+    is let through, which closes the breaker on success or opens it again
+    for a longer time on failure.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize."""
+        self.host = host
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        # How many times the breaker opened since the router last responded
+        self.trips = 0
+        self.retry_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next request is allowed."""
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def before_request(self) -> None:
+        """Raises RouterUnavailable if a request should not be sent now."""
+
+        if self.state == BREAKER_CLOSED:
+            return
+        if self.state == BREAKER_OPEN and time.monotonic() >= self.retry_at:
+            self.state = BREAKER_HALF_OPEN
+        if self.state == BREAKER_HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        raise RouterUnavailable(self.host, self.retry_in)
+
+    def end_probe(self) -> None:
+        """Lets another probe through once a request has ended, whatever its outcome.
+
+        A probe that neither failed nor succeeded (e.g. it was cancelled)
+        leaves the breaker half-open.
+        """
+
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Registers a response from the router."""
+
+        if self.state != BREAKER_CLOSED:
+            _LOGGER.info("Router %s is reachable again", self.host)
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Registers a request that failed to reach the router."""
+
+        self.failures += 1
+        self._probing = False
+        if self.state == BREAKER_OPEN:
+            return
+        if self.state == BREAKER_CLOSED and self.failures < BREAKER_FAILURE_THRESHOLD:
+            return
+        delay = min(
+            BREAKER_BASE_DELAY * 2**self.trips, RETRY_INTERVAL.total_seconds()
+        ) * random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+        # Warn only once per outage, failed probes are logged at debug level
+        log = _LOGGER.warning if self.trips == 0 else _LOGGER.debug
+        log("Router %s is unreachable, pausing requests for %.0f seconds", self.host, delay)
+        self.trips += 1
+        self.state = BREAKER_OPEN
+        self.retry_at = time.monotonic() + delay
+
 
 class CudyRouter:
     """Represents a router and provides functions for communication."""
 
     def __init__(
-        self, hass: HomeAssistant, host: str, username: str, password: str
+        self,
+        hass: HomeAssistant,
+        host: str,
+        username: str,
+        password: str,
+        session_store: Store | None = None,
     ) -> None:
         """Initialize."""
         self.host = host
         self.auth_cookie = None
+        # Wall clock time when the current cookie was received
+        self.auth_time: float | None = None
+        # How long a session lasted last time before the router rejected it
+        self.session_lifetime: float | None = None
+        self.session_store = session_store
+        # A delayed write of the session is scheduled and will take it when it runs
+        self._session_save_pending = False
+        # Login in progress, shared by every caller that needs a session meanwhile
+        self._login_task: asyncio.Task[bool] | None = None
+        self.auth_stats = {"logins_performed": 0, "logins_coalesced": 0}
         self.hass = hass
         self.username = username
         self.password = password
+        self.devices_cache = DeviceListCache()
+        self.missing_pages: set[str] = set()
+        self.breaker = CircuitBreaker(host)
+        # Shared with every other client of the same host
+        self.request_budget = async_get_scheduler(hass).budget(host)
+        self.metrics = RouterMetrics()
+        # Last raw responses, for the diagnostics (off unless enabled in the options)
+        self.capture: ResponseCapture | None = None
+        # Own session without a cookie jar: the session cookie is only sent
+        # explicitly (see get_cookie_header) and never shared with the other
+        # integrations. Home Assistant detaches it when the entry is unloaded.
+        self.session = async_create_clientsession(
+            hass, cookie_jar=aiohttp.DummyCookieJar()
+        )
+
+    def close(self) -> None:
+        """Releases the client session of a router used outside a config entry.
+
+        The session of a config entry is released when it is unloaded, the
+        others only when Home Assistant stops. The connector is shared with
+        the rest of Home Assistant, so the session is detached, not closed.
+        """
+
+        self.session.detach()
+
+    async def async_restore_session(self) -> None:
+        """Restores the session saved by a previous run, if it is likely still valid."""
+
+        if not self.session_store:
+            return
+        stored = await self.session_store.async_load()
+        if not stored or stored.get("host") != self.host:
+            return
+        self.session_lifetime = stored.get("lifetime")
+        cookie = stored.get("cookie")
+        auth_time = stored.get("auth_time")
+        if not cookie or not auth_time:
+            return
+        if self.session_lifetime and time.time() - auth_time >= self.session_lifetime:
+            _LOGGER.debug("Stored session for %s has probably expired", self.host)
+            return
+        _LOGGER.debug("Reusing stored session for %s", self.host)
+        self.auth_cookie = cookie
+        self.auth_time = auth_time
+
+    def _save_session(self) -> None:
+        """Schedules writing the current session to the disk.
+
+        The write is not scheduled again while one is pending, each call
+        would postpone it.
+        """
+
+        if self.session_store and not self._session_save_pending:
+            self._session_save_pending = True
+            self.session_store.async_delay_save(self._session_to_save, SESSION_SAVE_DELAY)
+
+    def _session_to_save(self) -> dict[str, Any]:
+        """Returns the session to write, called by the delayed write."""
+
+        self._session_save_pending = False
+        return {
+            "host": self.host,
+            "cookie": self.auth_cookie,
+            "auth_time": self.auth_time,
+            "lifetime": self.session_lifetime,
+        }
+
+    def _session_expired(self) -> None:
+        """Records the lifetime of the session that was rejected by the router."""
 
-    def get_cookie_header(self, force_auth: bool) -> str:
+        if self.auth_time:
+            self.session_lifetime = time.time() - self.auth_time
+            _LOGGER.debug(
+                "Session for %s expired after %d seconds",
+                self.host,
+                self.session_lifetime,
+            )
+        self.auth_cookie = None
+        self.auth_time = None
+        self._save_session()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        consumer: DeviceListParser | None = None,
+        endpoint: str | None = None,
+        **kwargs: Any,
+    ) -> tuple[int, str, SimpleCookie]:
+        """Sends a request over the (keep-alive) client session of the router.
+
+        Returns the status code, the decoded body and the cookies set by the response.
+        With a consumer, a successful response is fed to it chunk by chunk as it
+        arrives instead of being returned.
+        The time and size of successful responses are recorded under the endpoint
+        name, if given (the time spent in the consumer is left out), and the
+        responses are captured for the diagnostics when enabled.
+        Raises RouterUnavailable while the circuit breaker is open, without
+        spending the request budget of the host; otherwise waits for it.
+        """
+
+        self.breaker.before_request()
+        session = self.session
+        headers = {**DEFAULT_HEADERS, **kwargs.pop("headers", {})}
+        try:
+            await self.request_budget.acquire()
+            start = time.perf_counter()
+            async with session.request(
+                method, url, headers=headers, **kwargs
+            ) as response:
+                capture = self.capture if endpoint else None
+                if consumer is not None and response.status == 200:
+                    size = 0
+                    chunks: list[bytes] = []
+                    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        size += len(chunk)
+                        if capture is not None:
+                            chunks.append(chunk)
+                        # Once the consumer is done the rest is only drained,
+                        # so the connection can be kept alive
+                        if not consumer.done:
+                            consumer.feed(chunk)
+                    consumer.close()
+                    text = ""
+                    if capture is not None:
+                        body = b"".join(chunks).decode(
+                            response.charset or "utf-8", errors="replace"
+                        )
+                else:
+                    raw = await response.read()
+                    size = len(raw)
+                    body = text = raw.decode(response.charset or "utf-8", errors="replace")
+                result = response.status, text, response.cookies
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.breaker.record_failure()
+            raise
+        finally:
+            # A cancelled request (e.g. on shutdown) is not a failure of the router
+            self.breaker.end_probe()
+        self.breaker.record_success()
+        elapsed = time.perf_counter() - start
+        if consumer is not None:
+            elapsed -= consumer.parse_time
+        if endpoint and response.status == 200:
+            self.metrics.record(http_metric(endpoint), elapsed * 1000)
+            self.metrics.record(size_metric(endpoint), size)
+        if capture is not None:
+            capture.add(
+                endpoint, url, response.status, response.headers, body, elapsed * 1000
+            )
+        return result
+
+    async def get_cookie_header(self, force_auth: bool) -> str:
         """Returns a cookie header that should be used for authentication."""
 
         if not force_auth and self.auth_cookie:
             return f"sysauth={self.auth_cookie}"
-        if self.authenticate():
+        if await self.authenticate():
             return f"sysauth={self.auth_cookie}"
         else:
             return ""
 
-    def authenticate(self) -> bool:
-        """Test if we can authenticate with the host."""
+    async def authenticate(self) -> bool:
+        """Test if we can authenticate with the host.
 
-        login_url = f"http://{self.host}/cgi-bin/luci"
-        try:
-            resp = requests.get(login_url, timeout=10)
-            html = resp.text
-            soup = BeautifulSoup(html, "html.parser")
+        Only one login runs at a time, concurrent callers wait for its result
+        instead of logging in again (and invalidating each other's sessions).
+        """
+
+        if self._login_task is None or self._login_task.done():
+            self.auth_stats["logins_performed"] += 1
+            self._login_task = self.hass.async_create_task(self._timed_login())
+        else:
+            self.auth_stats["logins_coalesced"] += 1
+            _LOGGER.debug("Waiting for the login in progress to %s", self.host)
+        # A cancelled caller must not cancel the login the others are waiting for
+        return await asyncio.shield(self._login_task)
+
+    async def _timed_login(self) -> bool:
+        """Logs in, recording the time it takes."""
+
+        with self.metrics.timer(METRIC_LOGIN):
+            return await self._login()
 
-            def extract(name):
-                tag = soup.find("input", {"name": name})
-                return tag["value"] if tag and tag.has_attr("value") else ""
+    async def _login(self) -> bool:
+        """Logs in and stores the received session cookie."""
 
-            _csrf = extract("_csrf")
-            token = extract("token")
-            salt = extract("salt")
+        login_url = f"http://{self.host}/cgi-bin/luci"
+        try:
+            _, html, _ = await self._request("GET", login_url, timeout=LOGIN_TIMEOUT)
+            fields = parse_input_values(html)
+            _csrf = fields.get("_csrf", "")
+            token = fields.get("token", "")
+            salt = fields.get("salt", "")
+        except RouterUnavailable:
+            raise
         except Exception as e:
             _LOGGER.error("Error retrieving login page: %s", e)
             return False
@@ -98,65 +419,181 @@ class CudyRouter:
         headers = {"Content-Type": "application/x-www-form-urlencoded", "Cookie": ""}
 
         try:
-            response = requests.post(
-                data_url, timeout=30, headers=headers, data=body, allow_redirects=False
+            status, _, cookies = await self._request(
+                "POST",
+                data_url,
+                timeout=REQUEST_TIMEOUT,
+                headers=headers,
+                data=body,
+                allow_redirects=False,
             )
-            if response.ok:
-                cookie = SimpleCookie()
-                cookie.load(response.headers.get("set-cookie"))
-                self.auth_cookie = cookie.get("sysauth").value
+            if status < 400 and (cookie := cookies.get("sysauth")):
+                self.auth_cookie = cookie.value
+                self.auth_time = time.time()
+                self._save_session()
                 return True
-        except requests.exceptions.ConnectionError:
+        except (aiohttp.ClientError, asyncio.TimeoutError):
             _LOGGER.debug("Connection error?")
         return False
 
-    def get(self, url: str) -> str:
+    async def get(self, url: str, endpoint: str | None = None) -> str:
         """Retrieves data from the given URL using an authenticated session."""
 
+        return await self._get(url, endpoint=endpoint) or ""
+
+    async def stream(
+        self, url: str, consumer: DeviceListParser, endpoint: str | None = None
+    ) -> bool:
+        """Feeds the page at the given URL to the consumer while it is downloaded."""
+
+        return await self._get(url, consumer, endpoint) is not None
+
+    async def _get(
+        self,
+        url: str,
+        consumer: DeviceListParser | None = None,
+        endpoint: str | None = None,
+    ) -> str | None:
+        """Retrieves a page, returns None if it could not be retrieved."""
+
         retries = 2
         while retries > 0:
             retries -= 1
 
             data_url = f"http://{self.host}/cgi-bin/luci/{url}"
-            headers = {"Cookie": f"{self.get_cookie_header(False)}"}
+            cookie_header = await self.get_cookie_header(False)
+            headers = {"Cookie": cookie_header}
 
             try:
-                response = requests.get(
-                    data_url, timeout=30, headers=headers, allow_redirects=False
+                status, text, _ = await self._request(
+                    "GET",
+                    data_url,
+                    consumer,
+                    endpoint,
+                    timeout=REQUEST_TIMEOUT,
+                    headers=headers,
+                    allow_redirects=False,
                 )
-                if response.status_code == 403:
-                    if self.authenticate():
+                if status == 403:
+                    self.metrics.increment(COUNTER_RETRIES)
+                    if self.auth_cookie and cookie_header != f"sysauth={self.auth_cookie}":
+                        # Another request has already logged in again meanwhile
+                        continue
+                    self._session_expired()
+                    self.metrics.increment(COUNTER_REAUTHS)
+                    if await self.authenticate():
                         continue
                     else:
                         _LOGGER.error("Error during authentication to %s", url)
                         break
-                if response.ok:
-                    return response.text
+                if status == 404:
+                    # Not every model has every page (e.g. no modem), don't ask again
+                    _LOGGER.debug("Page %s is not available on %s", url, self.host)
+                    self.missing_pages.add(url)
+                    return None
+                if status < 400:
+                    return text
                 else:
                     break
-            except Exception:  # pylint: disable=broad-except
-                pass
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                # The circuit breaker reports the router being unreachable
+                _LOGGER.debug("Error retrieving data from %s: %s", url, err)
+                return None
 
         _LOGGER.error("Error retrieving data from %s", url)
-        return ""
+        return None
 
     async def get_data(
-        self, hass: HomeAssistant, options: dict[str, Any], previous_data: dict[str, Any] = None
+        self,
+        hass: HomeAssistant,
+        options: dict[str, Any],
+        previous_data: dict[str, Any] = None,
+        modules: Iterable[str] | None = None,
     ) -> dict[str, Any]:
-        """Retrieves data from the router"""
+        """Retrieves data from the router
 
-        data: dict[str, Any] = {}
+        Only the given modules are fetched (all of them by default), concurrently.
+        The other modules, and a module that cannot be retrieved, keep their
+        previous data, so one module does not blank the others.
+        """
 
-        # data[MODULE_MODEM] = parse_modem_info(
-        #     f"{await hass.async_add_executor_job(self.get, 'admin/network/gcom/status')}{await hass.async_add_executor_job(self.get, 'admin/network/gcom/status?detail=1')}"
-        # )
-        previous_devices = previous_data.get(MODULE_DEVICES) if previous_data else None
-        data[MODULE_DEVICES] = parse_devices(
-            await hass.async_add_executor_job(
-                self.get, "admin/network/devices/devlist?detail=1"
+        previous_data = previous_data or {}
+        fetchers = {
+            MODULE_MODEM: lambda: self._get_modem_data(options),
+            MODULE_DEVICES: lambda: self._get_devices_data(
+                options, previous_data.get(MODULE_DEVICES)
             ),
+        }
+        if modules is not None:
+            fetchers = {
+                module: fetcher
+                for module, fetcher in fetchers.items()
+                if module in modules
+            }
+        with self.metrics.timer(METRIC_POLL):
+            results = await asyncio.gather(
+                *(fetcher() for fetcher in fetchers.values()), return_exceptions=True
+            )
+
+        data: dict[str, Any] = dict(previous_data)
+        errors: list[BaseException] = []
+        for module, result in zip(fetchers, results):
+            if isinstance(result, BaseException):
+                errors.append(result)
+                _LOGGER.debug(
+                    "Error retrieving %s data from %s: %s", module, self.host, result
+                )
+            elif result is not None:
+                data[module] = result
+
+        if fetchers and len(errors) == len(fetchers):
+            for error in errors:
+                if isinstance(error, RouterUnavailable):
+                    raise error
+            raise ConnectionError(f"No data could be retrieved from {self.host}")
+        return data
+
+    async def _get_modem_data(self, options: dict[str, Any]) -> dict[str, Any] | None:
+        """Retrieves the 4G/LTE modem status, if the router has a modem"""
+
+        if MODEM_STATUS_PAGE in self.missing_pages:
+            return None
+        status, details = await asyncio.gather(
+            self.get(MODEM_STATUS_PAGE, ENDPOINT_MODEM),
+            self.get(f"{MODEM_STATUS_PAGE}?detail=1", ENDPOINT_MODEM),
+        )
+        if MODEM_STATUS_PAGE in self.missing_pages:
+            # Routers without a modem do not have the page
+            return None
+        if not status and not details:
+            raise ConnectionError("Modem status could not be retrieved")
+        with self.metrics.timer(METRIC_MODEM_PARSE):
+            return parse_modem_info(
+                f"{status}{details}", options and options.get(OPTIONS_PARSER_ENGINE)
+            )
+
+    async def _get_devices_data(
+        self, options: dict[str, Any], previous_devices: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        """Retrieves the connected devices"""
+
+        parser = DeviceListParser(engine=options and options.get(OPTIONS_PARSER_ENGINE))
+        if not await self.stream(DEVICES_PAGE, parser, ENDPOINT_DEVICES):
+            raise ConnectionError("Device list could not be retrieved")
+        start = time.perf_counter()
+        data = summarize_devices(
+            self.devices_cache.add_parsed(parser),
             options and options.get(OPTIONS_DEVICELIST),
             previous_devices,
         )
-
+        self.metrics.record(
+            METRIC_DEVICES_PARSE,
+            (parser.parse_time + time.perf_counter() - start) * 1000,
+        )
+        _LOGGER.debug(
+            "Device list parse cache for %s: %d hits, %d misses",
+            self.host,
+            self.devices_cache.hits,
+            self.devices_cache.misses,
+        )
         return data
@@ -0,0 +1,115 @@
+"""Polling schedule shared by every Cudy router of a Home Assistant instance."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+# Routers fetched at the same time, the others wait for a free slot
+MAX_CONCURRENT_FETCHES = 4
+# Requests per second sent to a router, and how many may be sent at once
+REQUEST_BUDGET_RATE = 2.0
+REQUEST_BUDGET_BURST = 10
+# Spreads the phases of any number of routers evenly (golden ratio)
+PHASE_STEP = 0.618033988749895
+
+
+class RequestBudget:
+    """Token bucket limiting the requests sent to a router.
+
+    Shared by everything that talks to the same host (the coordinator of the
+    config entry, the config flow validating it, etc.)
+    """
+
+    def __init__(
+        self, rate: float = REQUEST_BUDGET_RATE, burst: int = REQUEST_BUDGET_BURST
+    ) -> None:
+        """Initialize."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # Requests that had to wait for a token
+        self.throttled = 0
+
+    async def acquire(self) -> None:
+        """Waits until a request may be sent."""
+
+        waited = False
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                if waited:
+                    self.throttled += 1
+                return
+            waited = True
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FleetScheduler:
+    """Spreads the polls of the routers and limits how many run at once.
+
+    After a restart every config entry would otherwise be polled at the
+    same moment on every interval. Each entry gets a phase, an offset of
+    its first scheduled poll within the interval, and the fetches wait for
+    one of the few slots shared by all the routers.
+    """
+
+    def __init__(self, max_fetches: int = MAX_CONCURRENT_FETCHES) -> None:
+        """Initialize."""
+        self._fetch_slots = asyncio.Semaphore(max_fetches)
+        self._budgets: dict[str, RequestBudget] = {}
+        # Phase slot of each config entry
+        self._slots: dict[str, int] = {}
+
+    def budget(self, host: str) -> RequestBudget:
+        """Returns the request budget of a router."""
+
+        if (budget := self._budgets.get(host)) is None:
+            budget = self._budgets[host] = RequestBudget()
+        return budget
+
+    def phase(self, entry_id: str, interval: float) -> float:
+        """Returns the offset of the polls of a config entry within the interval.
+
+        Entries keep their slot until they are unloaded, the phases of the
+        first slots are far apart whatever the number of entries.
+        """
+
+        if (slot := self._slots.get(entry_id)) is None:
+            used = set(self._slots.values())
+            slot = next(index for index in range(len(used) + 1) if index not in used)
+            self._slots[entry_id] = slot
+        return (slot * PHASE_STEP) % 1 * interval
+
+    @callback
+    def release(self, entry_id: str) -> None:
+        """Frees the phase slot of an unloaded config entry."""
+
+        self._slots.pop(entry_id, None)
+
+    @asynccontextmanager
+    async def fetch_slot(self) -> AsyncIterator[None]:
+        """Waits for a free slot to fetch the data of a router."""
+
+        async with self._fetch_slots:
+            yield
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> FleetScheduler:
+    """Returns the scheduler of the Home Assistant instance."""
+
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = FleetScheduler()
+    return scheduler
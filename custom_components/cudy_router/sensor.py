@@ -1,22 +1,40 @@
 """Support for Cudy Router Sensor Platform."""
 from __future__ import annotations
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 import re
-from datetime import datetime
+import time
 from typing import Any
 
+from .bandwidth import BANDWIDTH_CONTEXT, WINDOWS, RateWindow
 from .const import (
     DOMAIN,
     MODULE_DEVICES,
     MODULE_MODEM,
     OPTIONS_DEVICELIST,
+    OPTIONS_DEVICES_ATTRIBUTE,
     SECTION_DETAILED,
-    OPTIONS_PRESENCE_TIMEOUT,
-    OPTIONS_PRESENCE_SIGNAL_CHECK,
     parse_device_entry,
 )
 from .coordinator import CudyRouterDataUpdateCoordinator
+from .entity import CudyRouterEntity, async_add_entities_batched
+from .metrics import (
+    COUNTER_REAUTHS,
+    COUNTER_RETRIES,
+    METRIC_DEVICES_HTTP,
+    METRIC_DEVICES_PARSE,
+    METRIC_DEVICES_SIZE,
+    METRIC_ENTITY_UPDATE,
+    METRIC_LOGIN,
+    METRIC_MODEM_HTTP,
+    METRIC_MODEM_PARSE,
+    METRIC_MODEM_SIZE,
+    METRIC_POLL,
+)
+from .models import devices_attributes
+from .presence import PRESENCE_CONTEXT
+from .usage import ROUTER_TOTAL, USAGE_CONTEXT
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -29,14 +47,15 @@ from homeassistant.const import (
     CONF_NAME,
     SIGNAL_STRENGTH_DECIBELS,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
     UnitOfDataRate,
+    UnitOfInformation,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 
 @dataclass
@@ -215,6 +234,7 @@ DEVICE_MAC_SENSOR = CudyRouterSensorEntityDescription(
     module="devices",
     name_suffix="mac",
     icon="mdi:network-outline",
+    entity_registry_enabled_default=False,
 )
 
 DEVICE_HOSTNAME_SENSOR = CudyRouterSensorEntityDescription(
@@ -222,6 +242,7 @@ DEVICE_HOSTNAME_SENSOR = CudyRouterSensorEntityDescription(
     module="devices",
     name_suffix="hostname",
     icon="mdi:network-outline",
+    entity_registry_enabled_default=False,
 )
 
 DEVICE_UPLOAD_SENSOR = CudyRouterSensorEntityDescription(
@@ -249,6 +270,7 @@ DEVICE_ONLINE_SENSOR = CudyRouterSensorEntityDescription(
     module="devices",
     name_suffix="online",
     icon="mdi:lan-connect",
+    entity_registry_enabled_default=False,
 )
 
 DEVICE_SIGNAL_SENSOR = CudyRouterSensorEntityDescription(
@@ -256,6 +278,17 @@ DEVICE_SIGNAL_SENSOR = CudyRouterSensorEntityDescription(
     module="devices",
     name_suffix="signal",
     icon="mdi:wifi",
+    entity_registry_enabled_default=False,
+)
+
+# Sensors of the values listed for every tracked device
+DEVICE_SENSORS = (
+    DEVICE_MAC_SENSOR,
+    DEVICE_HOSTNAME_SENSOR,
+    DEVICE_UPLOAD_SENSOR,
+    DEVICE_DOWNLOAD_SENSOR,
+    DEVICE_ONLINE_SENSOR,
+    DEVICE_SIGNAL_SENSOR,
 )
 
 DEVICE_PRESENCE_SENSOR = CudyRouterSensorEntityDescription(
@@ -266,6 +299,127 @@ DEVICE_PRESENCE_SENSOR = CudyRouterSensorEntityDescription(
 )
 
 
+
+def _bandwidth_sensor(direction: str, window: int) -> CudyRouterSensorEntityDescription:
+    """Describes a sensor of the average speed of a device over a window."""
+
+    minutes = window // 60
+    return CudyRouterSensorEntityDescription(
+        key=f"{direction}_speed_{minutes}m",
+        module="devices",
+        name_suffix=f"{direction} speed {minutes}m average",
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        icon="mdi:upload" if direction == "upload" else "mdi:download",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    )
+
+
+# Average speed sensors of the tracked devices, by direction and window
+DEVICE_BANDWIDTH_SENSORS = {
+    (direction, window): _bandwidth_sensor(direction, window)
+    for direction in ("upload", "download")
+    for window in WINDOWS
+}
+
+DEVICE_UPLOADED_SENSOR = CudyRouterSensorEntityDescription(
+    key="uploaded",
+    module="devices",
+    name_suffix="uploaded",
+    device_class=SensorDeviceClass.DATA_SIZE,
+    native_unit_of_measurement=UnitOfInformation.BYTES,
+    suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
+    icon="mdi:upload",
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    entity_registry_enabled_default=False,
+)
+DEVICE_DOWNLOADED_SENSOR = CudyRouterSensorEntityDescription(
+    key="downloaded",
+    module="devices",
+    name_suffix="downloaded",
+    device_class=SensorDeviceClass.DATA_SIZE,
+    native_unit_of_measurement=UnitOfInformation.BYTES,
+    suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
+    icon="mdi:download",
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    entity_registry_enabled_default=False,
+)
+TOTAL_UPLOADED_SENSOR = CudyRouterSensorEntityDescription(
+    key="total_uploaded",
+    module="devices",
+    name_suffix="total uploaded",
+    device_class=SensorDeviceClass.DATA_SIZE,
+    native_unit_of_measurement=UnitOfInformation.BYTES,
+    suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+    icon="mdi:upload",
+    state_class=SensorStateClass.TOTAL_INCREASING,
+)
+TOTAL_DOWNLOADED_SENSOR = CudyRouterSensorEntityDescription(
+    key="total_downloaded",
+    module="devices",
+    name_suffix="total downloaded",
+    device_class=SensorDeviceClass.DATA_SIZE,
+    native_unit_of_measurement=UnitOfInformation.BYTES,
+    suggested_unit_of_measurement=UnitOfInformation.GIGABYTES,
+    icon="mdi:download",
+    state_class=SensorStateClass.TOTAL_INCREASING,
+)
+
+
+MODULE_METRICS = "metrics"
+
+
+def _metric_sensor(
+    key: str, name_suffix: str, unit: str = UnitOfTime.MILLISECONDS
+) -> CudyRouterSensorEntityDescription:
+    """Describes a diagnostic sensor of the rolling p95 of a measurement."""
+
+    return CudyRouterSensorEntityDescription(
+        key=key,
+        module=MODULE_METRICS,
+        name_suffix=name_suffix,
+        native_unit_of_measurement=unit,
+        device_class=(
+            SensorDeviceClass.DATA_SIZE
+            if unit == UnitOfInformation.BYTES
+            else SensorDeviceClass.DURATION
+        ),
+        icon="mdi:timer-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+
+
+def _counter_sensor(key: str, name_suffix: str) -> CudyRouterSensorEntityDescription:
+    """Describes a diagnostic sensor of a counter."""
+
+    return CudyRouterSensorEntityDescription(
+        key=key,
+        module=MODULE_METRICS,
+        name_suffix=name_suffix,
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+
+
+METRIC_SENSORS = (
+    _metric_sensor(METRIC_POLL, "poll time"),
+    _metric_sensor(METRIC_LOGIN, "login time"),
+    _metric_sensor(METRIC_DEVICES_HTTP, "device list response time"),
+    _metric_sensor(METRIC_DEVICES_PARSE, "device list parse time"),
+    _metric_sensor(METRIC_DEVICES_SIZE, "device list size", UnitOfInformation.BYTES),
+    _metric_sensor(METRIC_MODEM_HTTP, "modem status response time"),
+    _metric_sensor(METRIC_MODEM_PARSE, "modem status parse time"),
+    _metric_sensor(METRIC_MODEM_SIZE, "modem status size", UnitOfInformation.BYTES),
+    _metric_sensor(METRIC_ENTITY_UPDATE, "entity update time"),
+    _counter_sensor(COUNTER_RETRIES, "request retries"),
+    _counter_sensor(COUNTER_REAUTHS, "re-authentications"),
+)
+
 def as_name(input_str: str) -> str:
     """Replaces any non-alphanumeric characters with underscore"""
 
@@ -315,6 +469,18 @@ async def async_setup_entry(
                 connected_devices_description,
             )
         )
+    entities.extend(
+        CudyRouterMetricSensor(coordinator, name, "metrics", description)
+        for description in METRIC_SENSORS
+    )
+    entities.append(
+        CudyRouterUsageSensor(coordinator, name, "total", TOTAL_UPLOADED_SENSOR)
+    )
+    entities.append(
+        CudyRouterUsageSensor(coordinator, name, "total", TOTAL_DOWNLOADED_SENSOR)
+    )
+    async_add_entities(entities)
+
     options = config_entry.options
     # Support both comma and newline separated values
     device_list_str = (options and options.get(OPTIONS_DEVICELIST)) or ""
@@ -323,6 +489,23 @@ async def async_setup_entry(
         x.strip()
         for x in device_list_str.split(",")
     ]
+    # Shared by the sensors of every tracked device
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
+        manufacturer="Cudy",
+        name=name,
+    )
+    await async_add_entities_batched(
+        async_add_entities, _device_sensors(coordinator, device_info, device_entries)
+    )
+
+
+def _device_sensors(
+    coordinator: CudyRouterDataUpdateCoordinator,
+    device_info: DeviceInfo,
+    device_entries: list[str],
+) -> Iterator[SensorEntity]:
+    """Creates the sensors of the tracked devices."""
 
     for device_entry in device_entries:
         if not device_entry:
@@ -330,35 +513,35 @@ async def async_setup_entry(
         friendly_name, device_id = parse_device_entry(device_entry)
         if not device_id:
             continue
-        entities.append(
-            CudyRouterDeviceSensor(coordinator, name, friendly_name, device_id, DEVICE_MAC_SENSOR)
-        )
-        entities.append(
-            CudyRouterDeviceSensor(coordinator, name, friendly_name, device_id, DEVICE_HOSTNAME_SENSOR)
-        )
-        entities.append(
-            CudyRouterDeviceSensor(coordinator, name, friendly_name, device_id, DEVICE_UPLOAD_SENSOR)
-        )
-        entities.append(
-            CudyRouterDeviceSensor(coordinator, name, friendly_name, device_id, DEVICE_DOWNLOAD_SENSOR)
-        )
-        entities.append(
-            CudyRouterDeviceSensor(coordinator, name, friendly_name, device_id, DEVICE_ONLINE_SENSOR)
+        yield from _tracked_device_sensors(coordinator, device_info, friendly_name, device_id)
+
+
+def _tracked_device_sensors(
+    coordinator: CudyRouterDataUpdateCoordinator,
+    device_info: DeviceInfo,
+    friendly_name: str,
+    device_id: str,
+) -> Iterator[SensorEntity]:
+    """Creates the sensors of a tracked device."""
+
+    for description in DEVICE_SENSORS:
+        yield CudyRouterDeviceSensor(
+            coordinator, device_info, friendly_name, device_id, description
         )
-        entities.append(
-            CudyRouterDeviceSensor(coordinator, name, friendly_name, device_id, DEVICE_SIGNAL_SENSOR)
+    yield CudyRouterPresenceSensor(
+        coordinator, device_info, friendly_name, device_id, DEVICE_PRESENCE_SENSOR
+    )
+    for description in (DEVICE_UPLOADED_SENSOR, DEVICE_DOWNLOADED_SENSOR):
+        yield CudyRouterDeviceUsageSensor(
+            coordinator, device_info, friendly_name, device_id, description
         )
-        # Use the new presence sensor class for presence
-        entities.append(
-            CudyRouterPresenceSensor(coordinator, name, friendly_name, device_id, DEVICE_PRESENCE_SENSOR)
+    for (direction, window), description in DEVICE_BANDWIDTH_SENSORS.items():
+        yield CudyRouterBandwidthSensor(
+            coordinator, device_info, friendly_name, device_id, description, direction, window
         )
 
-    async_add_entities(entities)
-
 
-class CudyRouterDeviceSensor(
-    CoordinatorEntity[CudyRouterDataUpdateCoordinator], SensorEntity
-):
+class CudyRouterDeviceSensor(CudyRouterEntity, SensorEntity):
     """Implementation of a Cudy Router device sensor."""
 
     _attr_has_entity_name = True
@@ -366,52 +549,40 @@ class CudyRouterDeviceSensor(
     def __init__(
         self,
         coordinator: CudyRouterDataUpdateCoordinator,
-        name: str | None,
+        device_info: DeviceInfo,
         friendly_name: str,
         device_id: str,
-        descriptionTemplate: CudyRouterSensorEntityDescription,
+        description: CudyRouterSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        description = CudyRouterSensorEntityDescription(
-            module=descriptionTemplate.module,
-            key=descriptionTemplate.key,
-            icon=descriptionTemplate.icon,
-            state_class=descriptionTemplate.state_class,
-            entity_category=descriptionTemplate.entity_category,
-            native_unit_of_measurement=descriptionTemplate.native_unit_of_measurement,
-            name_suffix=descriptionTemplate.name_suffix,
-        )
+        super().__init__(coordinator, (SECTION_DETAILED, device_id, description.key))
+        # The descriptions are shared by the sensors of every device
         self.entity_description = description
-        self._friendly_name = friendly_name
         self.device_key = device_id
-        self._sensor_name_prefix = as_name(friendly_name)
-        self._attrs: dict[str, Any] = {}
         self._attr_name = f"{friendly_name} {description.name_suffix}".strip()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
-            manufacturer="Cudy",
-            name=name,
+        self._attr_device_info = device_info
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}-{as_name(friendly_name)}-{description.key}"
         )
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{self._sensor_name_prefix}-{description.key}"
 
     @property
     def native_value(self) -> StateType:
         """Return the state of the resources."""
         if not self.coordinator.data:
             return None
+        # The device list may be missing (e.g. only the modem was fetched)
         device = (
-            self.coordinator.data[MODULE_DEVICES]
-            .get(SECTION_DETAILED)
+            self.coordinator.data.get(MODULE_DEVICES, {})
+            .get(SECTION_DETAILED, {})
             .get(self.device_key)
         )
         if not device:
             return None
         # For signal sensor, always return as string
         if self.entity_description.key == "signal":
-            val = device.get("signal")
+            val = device.signal
             return str(val) if val is not None else None
-        return device.get(self.entity_description.key)
+        return getattr(device, self.entity_description.key, None)
 
     @property
     def icon(self) -> str | None:
@@ -419,9 +590,7 @@ class CudyRouterDeviceSensor(
         return self.entity_description.icon
 
 
-class CudyRouterSensor(
-    CoordinatorEntity[CudyRouterDataUpdateCoordinator], SensorEntity
-):
+class CudyRouterSensor(CudyRouterEntity, SensorEntity):
     """Implementation of a Cudy Router sensor."""
 
     _attr_has_entity_name = True
@@ -434,7 +603,7 @@ class CudyRouterSensor(
         description: CudyRouterSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (description.module, description.key))
         self._sensor_name_prefix = sensor_name_prefix
         self.entity_description = description
         self._attrs: dict[str, Any] = {}
@@ -501,44 +670,18 @@ class CudyRouterSignalSensor(CudyRouterSensor):
 
 class CudyRouterPresenceSensor(CudyRouterDeviceSensor):
     """Presence sensor for a device connected to the Cudy Router."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(*args, **kwargs)
+        self.coordinator_context = (PRESENCE_CONTEXT, self.device_key)
+
     @property
     def native_value(self) -> StateType:
-        if not self.coordinator.data:
+        presence = self.coordinator.presence.get(self.device_key)
+        if presence is None:
             return None
-        device = (
-            self.coordinator.data[MODULE_DEVICES]
-            .get(SECTION_DETAILED)
-            .get(self.device_key)
-        )
-        if not device:
-            return None
-        config_entry = getattr(self.coordinator, 'config_entry', None)
-        timeout = 180
-        signal_check = True
-        if config_entry and hasattr(config_entry, 'options'):
-            timeout = int(config_entry.options.get(OPTIONS_PRESENCE_TIMEOUT, 180))
-            signal_check = config_entry.options.get(OPTIONS_PRESENCE_SIGNAL_CHECK, True)
-            if isinstance(signal_check, str):
-                signal_check = signal_check.lower() == "true"
-        last_seen = device.get("last_seen")
-        now_ts = datetime.now().timestamp()
-        if last_seen and (now_ts - last_seen) <= timeout:
-            connection = (device.get("connection") or "").lower()
-            signal = device.get("signal")
-
-            # Wired connections are always home
-            if "wired" in connection:
-                return "home"
-
-            # Wireless: check signal if enabled, otherwise consider present
-            if signal_check:
-                if signal and str(signal).strip() not in ("", "---"):
-                    return "home"
-            else:
-                # Signal check disabled - any device within timeout is home
-                return "home"
-
-        return "not_home"
+        return "home" if presence.home else "not_home"
 
     @property
     def icon(self) -> str | None:
@@ -550,9 +693,106 @@ class CudyRouterPresenceSensor(CudyRouterDeviceSensor):
         return self.entity_description.icon
 
 
+class CudyRouterBandwidthSensor(CudyRouterDeviceSensor):
+    """Average speed of a tracked device over the last minutes, with its peak."""
+
+    def __init__(
+        self,
+        coordinator: CudyRouterDataUpdateCoordinator,
+        device_info: DeviceInfo,
+        friendly_name: str,
+        device_id: str,
+        description: CudyRouterSensorEntityDescription,
+        direction: str,
+        window: int,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_info, friendly_name, device_id, description)
+        self.coordinator_context = (BANDWIDTH_CONTEXT, device_id)
+        self._direction = direction
+        self._window = window
+
+    def _rates(self) -> RateWindow | None:
+        """Return the statistics of the device in the direction of the sensor."""
+        bandwidth = self.coordinator.bandwidth.get(self.device_key)
+        if bandwidth is None:
+            return None
+        return bandwidth.upload if self._direction == "upload" else bandwidth.download
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the average speed over the window."""
+        if (rates := self._rates()) is None:
+            return None
+        average = rates.average(self._window, time.time())
+        return round(average, 2) if average is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the peak speed over the window."""
+        if (rates := self._rates()) is None:
+            return {}
+        return {"peak": rates.peak(self._window, time.time())}
+
+
+class CudyRouterDeviceUsageSensor(CudyRouterDeviceSensor):
+    """Data uploaded or downloaded by a tracked device."""
+
+    def __init__(
+        self,
+        coordinator: CudyRouterDataUpdateCoordinator,
+        device_info: DeviceInfo,
+        friendly_name: str,
+        device_id: str,
+        description: CudyRouterSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_info, friendly_name, device_id, description)
+        self.coordinator_context = (USAGE_CONTEXT, device_id)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the bytes transferred."""
+        return usage_value(self.coordinator, self.device_key, self.entity_description.key)
+
+
+class CudyRouterUsageSensor(CudyRouterSensor):
+    """Data uploaded or downloaded through the router."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(*args, **kwargs)
+        self.coordinator_context = (USAGE_CONTEXT, ROUTER_TOTAL)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the bytes transferred."""
+        return usage_value(self.coordinator, ROUTER_TOTAL, self.entity_description.key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return no attributes."""
+        return {}
+
+
+def usage_value(
+    coordinator: CudyRouterDataUpdateCoordinator, usage_key: str, sensor_key: str
+) -> int | None:
+    """Returns the bytes uploaded or downloaded by a device or the router."""
+
+    if sensor_key.endswith("uploaded"):
+        value = coordinator.usage.uploaded(usage_key)
+    else:
+        value = coordinator.usage.downloaded(usage_key)
+    return round(value) if value is not None else None
+
+
 class CudyRouterConnectedDevicesSensor(CudyRouterSensor):
     """Sensor that provides a list of all connected devices with their details."""
 
+    # The device list would be stored again in the database at every change
+    _unrecorded_attributes = frozenset({"devices"})
+
     @property
     def native_value(self) -> StateType:
         """Return the count of connected devices."""
@@ -562,3 +802,48 @@ class CudyRouterConnectedDevicesSensor(CudyRouterSensor):
         devices_data = self.coordinator.data.get(MODULE_DEVICES, {})
         connected_devices_data = devices_data.get("connected_devices", {})
         return connected_devices_data.get("value", 0)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the device count and the devices in the configured format."""
+        if not self.coordinator.data:
+            return {}
+
+        devices_data = self.coordinator.data.get(MODULE_DEVICES, {})
+        attributes = devices_data.get("connected_devices", {}).get("attributes", {})
+        return {
+            "device_count": attributes.get("device_count", 0),
+            **devices_attributes(
+                attributes.get("devices", []),
+                self.coordinator.config_entry.options.get(OPTIONS_DEVICES_ATTRIBUTE),
+            ),
+        }
+
+
+class CudyRouterMetricSensor(CudyRouterSensor):
+    """Diagnostic sensor of the timings and counters of the polls.
+
+    Measurements show their p95 over the recent polls, with the p50, max
+    and last value as attributes.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(*args, **kwargs)
+        # The metrics are recorded on every poll
+        self.coordinator_context = None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the p95 of the measurement or the counter value."""
+        metrics = self.coordinator.api.metrics
+        key = self.entity_description.key
+        if self.entity_description.state_class == SensorStateClass.TOTAL_INCREASING:
+            return metrics.counters.get(key, 0)
+        summary = metrics.summary(key)
+        return summary["p95"] if summary else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the rolling statistics of the measurement."""
+        return self.coordinator.api.metrics.summary(self.entity_description.key) or {}
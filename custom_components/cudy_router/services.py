@@ -0,0 +1,58 @@
+"""Services of the Cudy Router integration."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import DOMAIN, MODULE_DEVICES, SERVICE_GET_CONNECTED_DEVICES
+from .coordinator import CudyRouterDataUpdateCoordinator
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+GET_CONNECTED_DEVICES_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_CONFIG_ENTRY_ID): str}
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Registers the services of the integration."""
+
+    async def async_get_connected_devices(call: ServiceCall) -> ServiceResponse:
+        """Returns every connected device with all its details."""
+
+        coordinators: dict[str, CudyRouterDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None:
+            if entry_id not in coordinators:
+                raise ServiceValidationError(f"Unknown Cudy router config entry: {entry_id}")
+            coordinators = {entry_id: coordinators[entry_id]}
+
+        routers = []
+        for entry_id, coordinator in coordinators.items():
+            devices_data = (coordinator.data or {}).get(MODULE_DEVICES, {})
+            attributes = devices_data.get("connected_devices", {}).get("attributes", {})
+            routers.append(
+                {
+                    ATTR_CONFIG_ENTRY_ID: entry_id,
+                    "host": coordinator.host,
+                    "devices": [device.as_dict() for device in attributes.get("devices", [])],
+                }
+            )
+        return {"routers": routers}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CONNECTED_DEVICES,
+        async_get_connected_devices,
+        schema=GET_CONNECTED_DEVICES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,163 @@
+"""Last data of a Cudy router, kept across restarts."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+import time
+from typing import Any
+
+from homeassistant.helpers.storage import Store
+
+from .const import MODULE_DEVICES, SECTION_DETAILED
+from .models import ConnectionType, DeviceRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# Context of the staleness of the data in the coordinator changes
+STALE_CONTEXT = "stale"
+# Delay for writing the snapshot to the disk
+SNAPSHOT_SAVE_DELAY = 60
+# Older snapshots are not restored, their data would be misleading
+SNAPSHOT_MAX_AGE = 86400
+
+
+def _pack_record(record: DeviceRecord) -> list[Any]:
+    """Returns the values of the fields of a record (see DeviceRecord.__slots__)"""
+
+    return [getattr(record, field) for field in DeviceRecord.__slots__]
+
+
+def _unpack_record(fields: list[str], values: list[Any]) -> DeviceRecord:
+    """Creates a record from the values of the given fields."""
+
+    stored = dict(zip(fields, values))
+    return DeviceRecord(
+        **{
+            field: stored.get(field)
+            for field in DeviceRecord.__slots__
+            if field != "connection_type"
+        },
+        connection_type=ConnectionType(
+            stored.get("connection_type") or ConnectionType.UNKNOWN
+        ),
+    )
+
+
+def dump_data(data: dict[str, Any], updated_at: float) -> dict[str, Any]:
+    """Returns the coordinator data in a compact form that can be stored as JSON.
+
+    The device records are stored as lists of values, the names of their
+    fields are stored once.
+    """
+
+    modules = dict(data)
+    if devices := modules.get(MODULE_DEVICES):
+        devices = modules[MODULE_DEVICES] = dict(devices)
+        if connected := devices.get("connected_devices"):
+            attributes = connected.get("attributes") or {}
+            devices["connected_devices"] = {
+                **connected,
+                "attributes": {
+                    **attributes,
+                    "devices": [
+                        _pack_record(record) for record in attributes.get("devices") or []
+                    ],
+                },
+            }
+        if detailed := devices.get(SECTION_DETAILED):
+            devices[SECTION_DETAILED] = {
+                device_id: _pack_record(record) for device_id, record in detailed.items()
+            }
+    return {
+        "updated_at": updated_at,
+        "fields": list(DeviceRecord.__slots__),
+        "modules": modules,
+    }
+
+
+def load_data(stored: dict[str, Any]) -> tuple[dict[str, Any], float]:
+    """Returns the coordinator data and its time from the stored form (see dump_data)"""
+
+    fields = stored["fields"]
+    modules = dict(stored["modules"])
+    if devices := modules.get(MODULE_DEVICES):
+        devices = modules[MODULE_DEVICES] = dict(devices)
+        if connected := devices.get("connected_devices"):
+            attributes = connected.get("attributes") or {}
+            devices["connected_devices"] = {
+                **connected,
+                "attributes": {
+                    **attributes,
+                    "devices": [
+                        _unpack_record(fields, values)
+                        for values in attributes.get("devices") or []
+                    ],
+                },
+            }
+        if detailed := devices.get(SECTION_DETAILED):
+            devices[SECTION_DETAILED] = {
+                device_id: _unpack_record(fields, values)
+                for device_id, values in detailed.items()
+            }
+    return modules, float(stored["updated_at"])
+
+
+class CoordinatorSnapshot:
+    """The last data polled from the router, saved to the disk with a delay.
+
+    It is restored when the config entry is set up, so the entities come
+    up at once and the tracked devices keep their last_seen timestamps
+    while the first poll runs.
+    """
+
+    def __init__(self, store: Store | None = None) -> None:
+        """Initialize."""
+        self.store = store
+        # A delayed write is scheduled and will take the data when it runs
+        self._save_pending = False
+
+    async def async_load(self) -> tuple[dict[str, Any], float] | None:
+        """Returns the data saved by a previous run and its time, if recent enough."""
+
+        if not self.store:
+            return None
+        stored = await self.store.async_load()
+        if not stored:
+            return None
+        try:
+            data, updated_at = load_data(stored)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring invalid snapshot in %s: %s", self.store.key, err)
+            return None
+        if not 0 <= time.time() - updated_at <= SNAPSHOT_MAX_AGE:
+            return None
+        return data, updated_at
+
+    async def async_save(self, data: dict[str, Any], updated_at: float) -> None:
+        """Writes the data to the disk now (e.g. before the entry is reloaded)."""
+
+        if self.store:
+            self._save_pending = False
+            await self.store.async_save(dump_data(data, updated_at))
+
+    def save(self, data_to_save: Callable[[], tuple[dict[str, Any], float]]) -> None:
+        """Schedules writing the data returned by the callable to the disk.
+
+        The data is only serialized when it is written, once per delay. The
+        write is not scheduled again while one is pending, each call would
+        postpone it.
+        """
+
+        if self.store and not self._save_pending:
+            self._save_pending = True
+            self.store.async_delay_save(
+                lambda: self._dump(data_to_save), SNAPSHOT_SAVE_DELAY
+            )
+
+    def _dump(
+        self, data_to_save: Callable[[], tuple[dict[str, Any], float]]
+    ) -> dict[str, Any]:
+        """Returns the data to write, called by the delayed write."""
+
+        self._save_pending = False
+        return dump_data(*data_to_save())
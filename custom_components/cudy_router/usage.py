@@ -0,0 +1,106 @@
+"""Data transferred by the devices connected to a Cudy router."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.storage import Store
+
+# Key of the router totals, next to the ids of the tracked devices
+ROUTER_TOTAL = "total"
+# Context of the usage counters in the coordinator changes
+USAGE_CONTEXT = "usage"
+# Speeds are not integrated over longer gaps between two polls (e.g. outages)
+MAX_SAMPLE_GAP = 300
+# Delay for writing the counters to the disk
+USAGE_SAVE_DELAY = 60
+# Bytes transferred per second at 1 Mbps
+BYTES_PER_MBPS = 1_000_000 / 8
+
+
+class UsageCounters:
+    """Bytes uploaded and downloaded, integrated from the speeds read in the polls.
+
+    The transfer between two polls is the average of the two speeds read
+    times the time between them. The totals are saved to the disk with a
+    delay, so a restart only loses the transfer of the last poll.
+    """
+
+    def __init__(self, store: Store | None = None) -> None:
+        """Initialize."""
+        self.store = store
+        # Bytes uploaded and downloaded by key
+        self.totals: dict[str, list[float]] = {}
+        # Time and speeds of the last sample of each key
+        self._samples: dict[str, tuple[float, float, float]] = {}
+        # A delayed write is scheduled and will take the totals when it runs
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Restores the totals saved by a previous run."""
+
+        if not self.store:
+            return
+        stored = await self.store.async_load()
+        if stored:
+            self.totals = {
+                key: [float(uploaded), float(downloaded)]
+                for key, (uploaded, downloaded) in stored.get("totals", {}).items()
+            }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        return {"totals": self.totals}
+
+    def add(
+        self, key: str, up_speed: float | None, down_speed: float | None, timestamp: float
+    ) -> bool:
+        """Adds the speeds read at the given time, returns True if the totals changed."""
+
+        up_speed = up_speed or 0.0
+        down_speed = down_speed or 0.0
+        previous = self._samples.get(key)
+        self._samples[key] = (timestamp, up_speed, down_speed)
+        totals = self.totals.setdefault(key, [0.0, 0.0])
+        if previous is None:
+            return False
+        elapsed = timestamp - previous[0]
+        if not 0 < elapsed <= MAX_SAMPLE_GAP:
+            return False
+        totals[0] += (previous[1] + up_speed) / 2 * elapsed * BYTES_PER_MBPS
+        totals[1] += (previous[2] + down_speed) / 2 * elapsed * BYTES_PER_MBPS
+        return True
+
+    def missed(self, key: str) -> None:
+        """Forgets the last sample of a device that was not seen in a poll."""
+
+        self._samples.pop(key, None)
+
+    async def async_save(self) -> None:
+        """Writes the totals to the disk now (e.g. before the entry is reloaded)."""
+
+        if self.store:
+            await self.store.async_save(self._data_to_save())
+
+    def save(self) -> None:
+        """Schedules writing the totals to the disk.
+
+        The write is not scheduled again while one is pending: each call
+        would postpone it, and with polls more frequent than the delay the
+        totals would only be written on shutdown.
+        """
+
+        if self.store and not self._save_pending:
+            self._save_pending = True
+            self.store.async_delay_save(self._data_to_save, USAGE_SAVE_DELAY)
+
+    def uploaded(self, key: str) -> float | None:
+        """Returns the bytes uploaded, None if nothing was counted yet."""
+
+        totals = self.totals.get(key)
+        return totals[0] if totals else None
+
+    def downloaded(self, key: str) -> float | None:
+        """Returns the bytes downloaded, None if nothing was counted yet."""
+
+        totals = self.totals.get(key)
+        return totals[1] if totals else None
@@ -0,0 +1 @@
+"""Tests of the Cudy Router integration."""
@@ -0,0 +1,50 @@
+"""Helpers of the Cudy Router tests."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from aiohttp import web
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.cudy_router.const import DOMAIN
+
+
+@asynccontextmanager
+async def async_test_hass(config_dir: Path) -> AsyncIterator[HomeAssistant]:
+    """A bare Home Assistant instance, stopped on exit."""
+
+    hass = HomeAssistant(str(config_dir))
+    try:
+        yield hass
+    finally:
+        await hass.async_stop(force=True)
+
+
+@asynccontextmanager
+async def async_test_server(app: web.Application) -> AsyncIterator[str]:
+    """Serves the application on a free local port, yields its host."""
+
+    runner = web.AppRunner(app, shutdown_timeout=0.1)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+    try:
+        yield f"127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+def mock_config_entry(host: str, options: dict | None = None) -> MagicMock:
+    """A config entry of the integration for the given router."""
+
+    entry = MagicMock()
+    entry.domain = DOMAIN
+    entry.entry_id = f"entry-{host}"
+    entry.data = {CONF_HOST: host}
+    entry.options = options or {}
+    return entry
@@ -0,0 +1,43 @@
+"""Tests of the config flow of the Cudy Router integration."""
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import web
+import pytest
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+
+from custom_components.cudy_router import config_flow
+from custom_components.cudy_router.config_flow import InvalidAuth, validate_input
+
+from .common import async_test_hass, async_test_server
+
+
+def test_validation_releases_the_session(tmp_path, monkeypatch) -> None:
+    """The client session of the router is released after every validation."""
+
+    routers = []
+
+    class _Router(config_flow.CudyRouter):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            routers.append(self)
+
+    monkeypatch.setattr(config_flow, "CudyRouter", _Router)
+
+    async def login_page(request: web.Request) -> web.Response:
+        return web.Response(text="<html></html>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", login_page)
+
+    async def _test() -> None:
+        async with async_test_hass(tmp_path) as hass, async_test_server(app) as host:
+            data = {CONF_HOST: host, CONF_USERNAME: "admin", CONF_PASSWORD: "wrong"}
+            for _ in range(2):
+                with pytest.raises(InvalidAuth):
+                    await validate_input(hass, data)
+            assert len(routers) == 2
+            assert all(router.session.connector is None for router in routers)
+
+    asyncio.run(_test())
@@ -0,0 +1,46 @@
+"""Tests of the coordinator of the Cudy Router integration."""
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import web
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.cudy_router import coordinator as coordinator_module
+from custom_components.cudy_router.coordinator import CudyRouterDataUpdateCoordinator
+from custom_components.cudy_router.router import BREAKER_OPEN, CudyRouter, RouterUnavailable
+
+from .common import async_test_hass, async_test_server, mock_config_entry
+
+
+def test_hanging_router_opens_the_breaker(tmp_path, monkeypatch) -> None:
+    """Polls cut by the poll timeout count as failures of the router."""
+
+    monkeypatch.setattr(coordinator_module, "POLL_TIMEOUT", 0.2)
+
+    async def hang(request: web.Request) -> web.Response:
+        await asyncio.Event().wait()
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", hang)
+
+    async def _test() -> None:
+        async with async_test_hass(tmp_path) as hass, async_test_server(app) as host:
+            entry = mock_config_entry(host)
+            api = CudyRouter(hass, host, "admin", "admin")
+            coordinator = CudyRouterDataUpdateCoordinator(hass, entry, api)
+            coordinator.config_entry = entry
+            for _ in range(3):
+                coordinator._module_due.clear()
+                with pytest.raises(UpdateFailed) as err:
+                    await coordinator._async_update_data()
+                assert isinstance(err.value.__cause__, asyncio.TimeoutError)
+            assert api.breaker.state == BREAKER_OPEN
+
+            # Requests are rejected without reaching the router
+            with pytest.raises(RouterUnavailable):
+                api.breaker.before_request()
+            api._login_task.cancel()
+
+    asyncio.run(_test())
@@ -0,0 +1,97 @@
+"""Tests of the device trackers of the Cudy Router integration."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.cudy_router.const import (
+    DOMAIN,
+    OPTIONS_DEVICELIST,
+    OPTIONS_DISCOVER_CLIENTS,
+)
+from custom_components.cudy_router.coordinator import CudyRouterDataUpdateCoordinator
+from custom_components.cudy_router.device_tracker import (
+    _client_unique_id,
+    async_setup_entry,
+)
+from custom_components.cudy_router.discovery import ClientDiscovery
+from custom_components.cudy_router.models import DeviceRecord
+from custom_components.cudy_router.router import CudyRouter
+
+from .common import async_test_hass, mock_config_entry
+
+TRACKED = "02:00:00:00:00:01"
+DISCOVERED = "02:00:00:00:00:02"
+
+
+async def _async_setup(
+    hass: HomeAssistant, options: dict
+) -> tuple[er.EntityRegistry, CudyRouterDataUpdateCoordinator]:
+    """Sets up the trackers of a router with two discovered clients registered."""
+
+    entry = mock_config_entry("router", options)
+    registry = er.async_get(hass)
+    for mac in (TRACKED, DISCOVERED):
+        registry.async_get_or_create(
+            Platform.DEVICE_TRACKER, DOMAIN, _client_unique_id(entry, mac), config_entry=entry
+        )
+    coordinator = CudyRouterDataUpdateCoordinator(
+        hass, entry, CudyRouter(hass, "router", "admin", "admin")
+    )
+    coordinator.config_entry = entry
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    await async_setup_entry(hass, entry, MagicMock())
+    return registry, coordinator
+
+
+def _registered(registry: er.EntityRegistry) -> set[str]:
+    """Returns the MACs of the registered client trackers."""
+
+    return {
+        entry.unique_id.rsplit("-client-", 1)[1]
+        for entry in registry.entities.values()
+        if "-client-" in entry.unique_id
+    }
+
+
+def test_client_trackers_removed_without_discovery(tmp_path) -> None:
+    """Turning the discovery off removes the trackers of the discovered clients."""
+
+    async def _test() -> None:
+        async with async_test_hass(tmp_path) as hass:
+            await er.async_load(hass)
+            registry, coordinator = await _async_setup(hass, {})
+            assert coordinator.discovery is None
+            assert not _registered(registry)
+
+    asyncio.run(_test())
+
+
+def test_client_tracker_removed_once_tracked(tmp_path) -> None:
+    """A discovered client that is now tracked loses its discovered tracker."""
+
+    async def _test() -> None:
+        async with async_test_hass(tmp_path) as hass:
+            await er.async_load(hass)
+            registry, coordinator = await _async_setup(
+                hass,
+                {OPTIONS_DISCOVER_CLIENTS: True, OPTIONS_DEVICELIST: f"Phone={TRACKED}"},
+            )
+            assert _registered(registry) == {DISCOVERED}
+            assert set(coordinator.discovery.clients) == {DISCOVERED}
+
+    asyncio.run(_test())
+
+
+def test_discovered_client_forgotten_once_tracked() -> None:
+    """A client tracked by its hostname is dropped from the discovered ones."""
+
+    discovery = ClientDiscovery(86400, 200, 180)
+    client = DeviceRecord.create("phone", "10.0.0.2", DISCOVERED, 0.0, 0.0, "-50", "1m", "5G WiFi")
+    assert discovery.update([client], set(), 1000.0) == {DISCOVERED}
+    discovery.update([client], {DISCOVERED}, 1010.0)
+    assert not discovery.clients
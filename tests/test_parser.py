@@ -0,0 +1,75 @@
+"""Tests of the parsers of the Cudy Router integration."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from benchmarks.fixtures import devlist_page, gcom_page, load_captures
+from custom_components.cudy_router import parser
+from custom_components.cudy_router.parser import (
+    DeviceListParser,
+    get_all_devices,
+    parse_devices,
+    parse_modem_info,
+)
+
+ENGINES = list(parser.PARSER_ENGINES)
+
+DEVLIST_PAGES = {
+    "generated-0": devlist_page(0),
+    "generated-1": devlist_page(1, seed=1),
+    "generated-60": devlist_page(60, seed=60),
+}
+GCOM_PAGES = {"generated": gcom_page()}
+for _name, _page in load_captures().items():
+    (DEVLIST_PAGES if _name.startswith("devlist") else GCOM_PAGES)[_name] = _page
+
+
+def _stream(page: str, engine: str, chunk_size: int = 97) -> list:
+    """Parses the page fed in small chunks, like a streamed response."""
+
+    device_parser = DeviceListParser(engine=engine)
+    raw = page.encode()
+    for start in range(0, len(raw), chunk_size):
+        device_parser.feed(raw[start : start + chunk_size])
+    device_parser.close()
+    return device_parser.devices
+
+
+class _FixedDatetime(datetime):
+    """Always the same time, for the last_seen timestamps."""
+
+    @classmethod
+    def now(cls, tz=None) -> datetime:
+        return cls(2024, 1, 1, tzinfo=tz)
+
+
+@pytest.mark.parametrize("name", DEVLIST_PAGES)
+def test_engines_parse_the_same_devices(name: str, monkeypatch) -> None:
+    """Every parser engine finds the same devices, streamed or not."""
+
+    monkeypatch.setattr(parser, "datetime", _FixedDatetime)
+    page = DEVLIST_PAGES[name]
+    expected = get_all_devices(page, ENGINES[0])
+    if name != "generated-0":
+        assert expected
+    device_list = "\n".join(
+        f"device-{i}={device.mac}" for i, device in enumerate(expected[:5])
+    )
+    expected_data = parse_devices(page, device_list, engine=ENGINES[0])
+    for engine in ENGINES:
+        assert get_all_devices(page, engine) == expected, engine
+        assert _stream(page, engine) == expected, engine
+        assert parse_devices(page, device_list, engine=engine) == expected_data, engine
+
+
+@pytest.mark.parametrize("name", GCOM_PAGES)
+def test_engines_parse_the_same_modem_info(name: str) -> None:
+    """Every parser engine reads the same modem status."""
+
+    page = GCOM_PAGES[name]
+    expected = parse_modem_info(page, ENGINES[0])
+    assert expected
+    for engine in ENGINES:
+        assert parse_modem_info(page, engine) == expected, engine
@@ -0,0 +1,109 @@
+"""Tests of the sensors of the Cudy Router integration."""
+from __future__ import annotations
+
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.helpers.entity import DeviceInfo
+
+from benchmarks.fixtures import gcom_page, random_client, render_devlist
+from custom_components.cudy_router.binary_sensor import CudyRouterDevicePresenceBinarySensor
+from custom_components.cudy_router.const import DOMAIN, MODULE_DEVICES, MODULE_MODEM
+from custom_components.cudy_router.coordinator import CudyRouterDataUpdateCoordinator
+from custom_components.cudy_router.device_tracker import CudyRouterDeviceTracker
+from custom_components.cudy_router.parser import parse_devices, parse_modem_info
+from custom_components.cudy_router.router import CudyRouter
+from custom_components.cudy_router.sensor import _tracked_device_sensors
+
+from .common import async_test_hass, mock_config_entry
+
+MAC = "02:00:00:00:00:01"
+
+
+def test_device_entities_without_device_list(tmp_path) -> None:
+    """The first poll only got the modem status, the device list failed."""
+
+    async def _test() -> None:
+        async with async_test_hass(tmp_path) as hass:
+            entry = mock_config_entry("router", {"device_list": f"Phone={MAC}"})
+            api = CudyRouter(hass, "router", "admin", "admin")
+            api._get_devices_data = AsyncMock(side_effect=ConnectionError)
+            api._get_modem_data = AsyncMock(return_value=parse_modem_info(gcom_page(1)))
+            coordinator = CudyRouterDataUpdateCoordinator(hass, entry, api)
+            coordinator.config_entry = entry
+            coordinator.data = await coordinator._async_update_data()
+            assert MODULE_MODEM in coordinator.data
+            assert MODULE_DEVICES not in coordinator.data
+
+            device_info = DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+            for sensor in _tracked_device_sensors(coordinator, device_info, "Phone", MAC):
+                assert sensor.native_value in (None, "not_home")
+                assert isinstance(sensor.extra_state_attributes or {}, dict)
+            presence = CudyRouterDevicePresenceBinarySensor(coordinator, "Phone", MAC)
+            assert not presence.is_on
+            assert isinstance(presence.extra_state_attributes, dict)
+            tracker = CudyRouterDeviceTracker(coordinator, "Phone", MAC)
+            assert not tracker.is_connected
+            assert isinstance(tracker.extra_state_attributes, dict)
+
+    asyncio.run(_test())
+
+
+def test_presence_entities_written_on_changes(tmp_path) -> None:
+    """The presence binary sensor and tracker skip the polls that change nothing."""
+
+    rng = random.Random(0)
+    client, other = random_client(rng, 1), random_client(rng, 2)
+    client["connection"] = "Wired"
+    mac = client["mac"]
+    device_list = f"Phone={mac}"
+    pages = [
+        render_devlist([client, other]),
+        render_devlist([client, other]),
+        render_devlist([other]),
+    ]
+
+    async def _test() -> None:
+        async with async_test_hass(tmp_path) as hass:
+            entry = mock_config_entry("router", {"device_list": device_list})
+            api = CudyRouter(hass, "router", "admin", "admin")
+            coordinator = CudyRouterDataUpdateCoordinator(hass, entry, api)
+            coordinator.config_entry = entry
+            presence = CudyRouterDevicePresenceBinarySensor(coordinator, "Phone", mac)
+            tracker = CudyRouterDeviceTracker(coordinator, "Phone", mac)
+            for entity in (presence, tracker):
+                entity.async_write_ha_state = MagicMock()
+
+            async def poll(page: str) -> None:
+                # Parsed while polling, like the device list of the router
+                api.get_data = AsyncMock(
+                    side_effect=lambda hass, options, previous, modules: {
+                        MODULE_DEVICES: parse_devices(
+                            page, device_list, (previous or {}).get(MODULE_DEVICES)
+                        )
+                    }
+                )
+                coordinator._module_due.clear()
+                coordinator.data = await coordinator._async_update_data()
+                for entity in (presence, tracker):
+                    entity.async_write_ha_state.reset_mock()
+                    entity._handle_coordinator_update()
+
+            await poll(pages[0])
+            assert presence.is_on
+            presence.async_write_ha_state.assert_called_once()
+            tracker.async_write_ha_state.assert_called_once()
+
+            # Same device list, only last_seen has moved on
+            await poll(pages[1])
+            presence.async_write_ha_state.assert_not_called()
+            tracker.async_write_ha_state.assert_not_called()
+
+            # Missing but still home: last_seen_seconds_ago is counting
+            await poll(pages[2])
+            assert presence.is_on
+            presence.async_write_ha_state.assert_called_once()
+            tracker.async_write_ha_state.assert_not_called()
+
+    asyncio.run(_test())